@@ -0,0 +1,207 @@
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from contextlib import redirect_stdout
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(REPO_ROOT / "pz-translator"), str(REPO_ROOT)]
+
+import translate
+import convert_txt_to_json
+from backends import MockBackend
+from scheduler import Scheduler, RetryPolicy, DEFAULT_MAX_WORKERS
+from synthetic_tree import SyntheticTree, item_name_txt
+import txt_tokenizer
+import legacy_parse_txt
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def timed(fn, *args, verbose: bool = False, **kwargs):
+    sink  = sys.stdout if verbose else io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(sink):
+        result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def bench_translate(tree: Path, args) -> dict:
+    backend   = MockBackend(latency=args.latency, per_item=args.per_item, error_rate=args.error_rate)
+    scheduler = Scheduler(args.max_workers, retry=RetryPolicy(base_delay=0.01))
+    plan, elapsed = timed(
+        translate.translate_tree, tree, args.languages,
+        backend=backend, scheduler=scheduler, verbose=args.verbose
+    )
+    scheduler.shutdown()
+
+    sent = backend.strings
+    return {
+        "wall_s":          round(elapsed, 3),
+        "strings":         plan.requested,
+        "unique_strings":  plan.unique_count,
+        "strings_per_s":   round(plan.requested / elapsed, 1) if elapsed else None,
+        "backend_calls":   backend.calls,
+        "backend_strings": sent,
+        "backend_chars":   backend.characters,
+        "cache_hit_rate":  round(1 - sent / plan.requested, 4) if plan.requested else None,
+        "retries":         scheduler.retries,
+        "peak_rss_mb":     peak_rss_mb(),
+    }
+
+
+def bench_parse_txt(tree: Path, args) -> dict:
+    datasets = {
+        "tree":       [convert_txt_to_json.read_txt(path) for path in tree.rglob("*.txt")],
+        "item_names": [item_name_txt(args.item_names, args.seed)],
+    }
+    parsers = {
+        "tokenizer": lambda text: txt_tokenizer.parse(text).entries,
+        "legacy":    legacy_parse_txt.parse_txt,
+    }
+
+    results = {}
+    for dataset, texts in datasets.items():
+        results[dataset] = {}
+        for label, parse in parsers.items():
+            entries, elapsed = timed(lambda: sum(len(parse(text)) for text in texts))
+            results[dataset][label] = {
+                "wall_s":        round(elapsed, 4),
+                "files":         len(texts),
+                "entries":       entries,
+                "entries_per_s": round(entries / elapsed, 1) if elapsed else None,
+            }
+        results[dataset]["mismatches"] = sum(
+            txt_tokenizer.parse(text).entries != legacy_parse_txt.parse_txt(text) for text in texts
+        )
+    results["peak_rss_mb"] = peak_rss_mb()
+    return results
+
+
+def bench_convert(tree: Path, args) -> dict:
+    _, elapsed = timed(convert_txt_to_json.convert, tree, jobs=args.jobs, verbose=args.verbose)
+    files = sum(1 for _ in tree.rglob("*.txt"))
+    return {
+        "wall_s":      round(elapsed, 3),
+        "txt_files":   files,
+        "files_per_s": round(files / elapsed, 1) if elapsed else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def flatten(metrics: dict, prefix: str = "") -> dict:
+    flat = {}
+    for name, value in metrics.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{name}."))
+        else:
+            flat[f"{prefix}{name}"] = value
+    return flat
+
+
+def compare(current: dict, baseline_path: Path):
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    previous = flatten(baseline.get("results", {}))
+    print(f"\nCompared with {baseline_path.name} ({baseline.get('revision') or '?'}):")
+    for name, value in flatten(current["results"]).items():
+        before = previous.get(name)
+        if isinstance(value, (int, float)) and isinstance(before, (int, float)) and before:
+            print(f"  {name:<36}  {before:>12}  →  {value:<12}  ({value / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+    parser = argparse.ArgumentParser(description="PZ Translator benchmark")
+    parser.add_argument("-mods",        type=int,   default=20)
+    parser.add_argument("-files",       type=int,   default=5)
+    parser.add_argument("-keys",        type=int,   default=200)
+    parser.add_argument("-txt-ratio",   type=float, default=0.3)
+    parser.add_argument("-b41-ratio",   type=float, default=0.1)
+    parser.add_argument("-duplicates",  type=float, default=0.4)
+    parser.add_argument("-seed",        type=int,   default=0)
+    parser.add_argument("-item-names",  type=int,   default=20000)
+    parser.add_argument("-languages",   nargs="*",  default=["DE", "FR", "ES", "RU", "PL", "PTBR"])
+    parser.add_argument("-latency",     type=float, default=0.02)
+    parser.add_argument("-per-item",    type=float, default=0.0)
+    parser.add_argument("-error-rate",  type=float, default=0.0)
+    parser.add_argument("-max-workers", type=int,   default=DEFAULT_MAX_WORKERS)
+    parser.add_argument("-jobs",        type=int,   default=None)
+    parser.add_argument("-stages",      nargs="*",  default=["translate", "parse_txt", "convert"])
+    parser.add_argument("-tree",        default=None)
+    parser.add_argument("-out",         default=None)
+    parser.add_argument("-compare",     default=None)
+    parser.add_argument("-verbose",     action="store_true")
+    args = parser.parse_args()
+
+    generator = SyntheticTree(
+        mods=args.mods, files=args.files, keys=args.keys, txt_ratio=args.txt_ratio,
+        b41_ratio=args.b41_ratio, duplicate_ratio=args.duplicates, seed=args.seed
+    )
+    workdir = Path(args.tree) if args.tree else Path(tempfile.mkdtemp(prefix="pz-bench-"))
+    stages  = {"translate": bench_translate, "parse_txt": bench_parse_txt, "convert": bench_convert}
+
+    try:
+        tree_stats = generator.generate(workdir)
+        print(
+            f"Tree: {tree_stats['mods']} mod(s) ({tree_stats['b41_mods']} B41, {tree_stats['txt_mods']} txt)"
+            f"  |  {tree_stats['files']} file(s)  |  {tree_stats['keys']} key(s)"
+            f"  |  {tree_stats['unique_values']} unique value(s)"
+        )
+
+        results = {}
+        for stage in args.stages:
+            # each stage gets a pristine tree so earlier stages' output does not skew later ones
+            stage_dir = workdir.with_name(f"{workdir.name}-{stage}")
+            shutil.copytree(workdir, stage_dir)
+            try:
+                results[stage] = stages[stage](stage_dir, args)
+            finally:
+                shutil.rmtree(stage_dir, ignore_errors=True)
+            print(f"  {stage:<10}  {json.dumps(results[stage])}")
+
+        report = {
+            "revision":  git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python":    platform.python_version(),
+            "platform":  platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "params":    {k: v for k, v in vars(args).items() if k not in ("out", "compare", "tree", "verbose")},
+            "tree":      tree_stats,
+            "results":   results,
+        }
+        if args.out:
+            Path(args.out).write_text(json.dumps(report, indent=4), encoding="utf-8")
+            print(f"\nResults written to {args.out}")
+        if args.compare:
+            compare(report, Path(args.compare))
+    finally:
+        if not args.tree:
+            shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,28 @@
+import re
+
+
+def parse_txt(text: str) -> dict:
+    """The regex + splitlines parser used before txt_tokenizer, without its console output. Kept as a baseline."""
+    match = re.search(r"\{(.*)\}", text, re.DOTALL)
+    if not match:
+        return {}
+
+    entries = {}
+    for line in match.group(1).splitlines():
+        line = line.strip()
+        if not line or line.startswith("--") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        key   = key.strip()
+        value = value.strip()
+
+        if value.startswith('"'):
+            close = value.find('"', 1)
+            while close != -1 and value[close - 1] == '\\':
+                close = value.find('"', close + 1)
+            if close == -1:
+                value = value[1:].replace('\\"', '"')
+            else:
+                value = value[1:close].replace('\\"', '"')
+        entries[key] = value
+    return entries
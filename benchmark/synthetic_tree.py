@@ -0,0 +1,117 @@
+import json
+import random
+from pathlib import Path
+
+FILE_STEMS = [
+    "IG_UI", "ItemName", "Tooltip", "ContextMenu", "Recipes", "Sandbox", "UI",
+    "Moodles", "EvolvedRecipeName", "Farming", "Challenge", "Stash", "DynamicRadio",
+]
+
+WORDS = [
+    "box", "nails", "screws", "open", "close", "remove", "add", "water", "bottle", "empty", "full",
+    "hammer", "saw", "plank", "door", "window", "barricade", "zombie", "generator", "fuel", "can",
+    "canned", "food", "soup", "ration", "medical", "bandage", "sterilized", "rag", "dirty", "clean",
+    "skill", "carpentry", "metalworking", "cooking", "farming", "fishing", "trapping", "foraging",
+    "tailoring", "level", "required", "not", "enough", "you", "need", "a", "the", "of", "with",
+    "to", "in", "on", "craft", "build", "repair", "condition", "weight", "capacity", "container",
+]
+
+COMMON_STRINGS = [
+    "Open", "Close", "Remove", "Add", "Cancel", "Confirm", "Repair", "Drop", "Equip", "Unequip",
+    "Rename", "Inspect", "Empty", "Fill", "Take All", "Place", "Rotate", "Disassemble", "Read",
+]
+
+PLACEHOLDERS = [" %1", " <LINE>", " <RGB:1,0,0>", " [img=media/ui/icon.png]", " %2 / %3"]
+
+
+def item_name_txt(keys: int, seed: int = 0) -> str:
+    """A single large ItemName_EN.txt-style table, as shipped by big item mods."""
+    rng   = random.Random(seed)
+    lines = ["ItemName_EN = {", ""]
+    for k in range(keys):
+        if k % 50 == 0:
+            lines.append(f"    -- Section {k // 50}")
+        words = rng.choices(WORDS, k=rng.randint(1, 4))
+        lines.append(f'    ItemName_Base.{"".join(w.capitalize() for w in words)}{k} = "{" ".join(words).title()}",')
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+class SyntheticTree:
+    """
+    Deterministic synthetic Workshop tree: N mods × M files × K keys.
+    Mods are B42 (…/42/media/…) or B41 (…/media/… — ignored by the tool), and use either JSON or
+    pre-42.15 .txt sources. A share of values is drawn from a pool common to all mods.
+    """
+
+    def __init__(self, mods: int = 10, files: int = 5, keys: int = 200, txt_ratio: float = 0.3,
+                 b41_ratio: float = 0.1, duplicate_ratio: float = 0.4, seed: int = 0):
+        self.mods            = mods
+        self.files           = min(files, len(FILE_STEMS))
+        self.keys            = keys
+        self.txt_ratio       = txt_ratio
+        self.b41_ratio       = b41_ratio
+        self.duplicate_ratio = duplicate_ratio
+        self.seed            = seed
+        self.stats           = {}
+
+    def _phrase(self, rng: random.Random) -> str:
+        words = rng.choices(WORDS, k=rng.randint(1, 8))
+        text  = " ".join(words).capitalize()
+        if rng.random() < 0.15:
+            text += rng.choice(PLACEHOLDERS)
+        return text
+
+    def _common_pool(self, rng: random.Random) -> list:
+        pool = list(COMMON_STRINGS)
+        pool += [self._phrase(rng) for _ in range(max(50, self.keys // 2))]
+        return pool
+
+    @staticmethod
+    def _write_txt(path: Path, table: str, entries: dict):
+        lines = [f"{table} = {{"]
+        for key, value in entries.items():
+            escaped = value.replace('"', '\\"')
+            lines.append(f'    {key} = "{escaped}",')
+        lines.append("}")
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    def generate(self, root: Path) -> dict:
+        rng    = random.Random(self.seed)
+        common = self._common_pool(rng)
+        stats  = {"mods": 0, "b41_mods": 0, "txt_mods": 0, "files": 0, "keys": 0, "unique_values": 0}
+        values = set()
+
+        for m in range(self.mods):
+            name   = f"SyntheticMod{m:03d}"
+            is_b41 = rng.random() < self.b41_ratio
+            is_txt = rng.random() < self.txt_ratio
+            mod    = root / "Workshop" / name / "Contents" / "mods" / name
+            source = (mod if is_b41 else mod / "42") / "media" / "lua" / "shared" / "Translate" / "EN"
+            source.mkdir(parents=True, exist_ok=True)
+
+            stats["mods"]     += 1
+            stats["b41_mods"] += is_b41
+            stats["txt_mods"] += is_txt and not is_b41
+
+            for stem in FILE_STEMS[:self.files]:
+                entries = {}
+                for k in range(self.keys):
+                    value = rng.choice(common) if rng.random() < self.duplicate_ratio else self._phrase(rng)
+                    entries[f"{stem}_{name}_{k}"] = value
+                    if not is_b41:
+                        values.add(value)
+
+                if is_txt:
+                    self._write_txt(source / f"{stem}_EN.txt", f"{stem}_EN", entries)
+                else:
+                    (source / f"{stem}.json").write_text(
+                        json.dumps(entries, indent=4, ensure_ascii=False), encoding="utf-8"
+                    )
+                if not is_b41:
+                    stats["files"] += 1
+                    stats["keys"]  += len(entries)
+
+        stats["unique_values"] = len(values)
+        self.stats = stats
+        return stats
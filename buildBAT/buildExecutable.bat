@@ -16,8 +16,9 @@ set OUTPUT_PATH=..
 
 :: Run PyInstaller with correct paths
 %PYTHON_EXECUTABLE% -m PyInstaller --onefile --windowed --name %EXE_NAME% ^
-    --add-data "..\..\pz-translator\translate.py;pz-translator" ^
+    --add-data "..\..\pz-translator\*.py;pz-translator" ^
     --add-data "..\..\pz-translator\LanguagesInfo_b42.json;pz-translator" ^
+    --add-data "..\..\pz-translator\LanguagesInfo_b42.json;." ^
     --workpath build ^
     --specpath build ^
     --distpath %OUTPUT_PATH% ^
@@ -1,8 +1,16 @@
 import os
-import re
-import json
 import sys
+import time
+import argparse
 from pathlib import Path
+from itertools import repeat
+from typing import NamedTuple
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "pz-translator"))
+import txt_tokenizer
+import scanner
+from json_writer import write_json
 
 ALL_LANG_CODES = {
     "AR", "CA", "CH", "CN", "CS", "DA", "DE", "EN", "ES", "FI",
@@ -22,15 +30,6 @@ def warn(msg: str):      print(f"{GOLDENROD}{msg}{RESET}")
 def error(msg: str):     print(f"{RED}{msg}{RESET}")
 
 
-def is_b41_folder(path: Path) -> bool:
-    current = path
-    while current != current.parent:
-        if current.name.lower() == "mods":
-            return len(path.relative_to(current).parts) == 5
-        current = current.parent
-    return False
-
-
 def read_txt(path: Path) -> str:
     try:
         return path.read_text(encoding="utf-8-sig")
@@ -38,42 +37,6 @@ def read_txt(path: Path) -> str:
         return path.read_text(encoding="latin-1")
 
 
-def parse_txt(text: str, path: Path) -> dict:
-    match = re.search(r"\{(.*)\}", text, re.DOTALL)
-    if not match:
-        return {}
-
-    entries = {}
-    for line in match.group(1).splitlines():
-        line = line.strip()
-        if not line or line.startswith("--") or "=" not in line:
-            continue
-        key, value = line.split("=", 1)
-        key   = key.strip()
-        value = value.strip()
-
-        if value.startswith('"'):
-            # Find the closing quote, ignoring escaped quotes inside the value
-            close = value.find('"', 1)
-            while close != -1 and value[close - 1] == '\\':
-                close = value.find('"', close + 1)
-            if close == -1:
-                malformed(f"  [!] No closing quote for '{key}' in {path.name} — used as-is")
-                malformed(f"      Got: {value}")
-                value = value[1:].replace('\\"', '"')
-            else:
-                # Check for trailing period after the closing quote
-                trailing = value[close + 1:].lstrip(", ")
-                if trailing.startswith("."):
-                    handled(f"  [~] Trailing period corrected for '{key}' in {path.name}")
-                value = value[1:close].replace('\\"', '"')
-
-        if key in entries:
-            warn(f"  [!] Duplicate key '{key}' in {path.name}")
-        entries[key] = value
-    return entries
-
-
 KEY_PREFIX_STRIP = {
     "EvolvedRecipeName": "EvolvedRecipeName_",
     "Recipes":           "Recipe_",
@@ -98,58 +61,127 @@ def json_output_name(txt_stem: str) -> str:
     return txt_stem + ".json"
 
 
-def convert(root: Path):
-    converted = 0
-    skipped   = 0
+class Conversion(NamedTuple):
+    txt_path:  Path
+    json_name: str
+    status:    str   # converted | unchanged | up to date | empty | failed
+    keys:      int
+    messages:  list  # (level, text), printed by the parent in file order
 
-    for translate_dir in root.rglob("Translate"):
-        if not translate_dir.is_dir():
-            continue
-        if is_b41_folder(translate_dir):
-            print(f"[B41 skipped]  {translate_dir}")
-            continue
 
-        print(f"\n[B42]  {translate_dir}")
+def convert_file(txt_path: Path, force: bool = False) -> Conversion:
+    """Converts one .txt file. Runs in a worker process, so nothing is printed here."""
+    json_path = txt_path.parent / json_output_name(txt_path.stem)
+    messages  = []
+    try:
+        if not force and json_path.stat().st_mtime_ns >= txt_path.stat().st_mtime_ns:
+            return Conversion(txt_path, json_path.name, "up to date", 0, messages)
+    except OSError:
+        pass
 
-        for txt_path in translate_dir.rglob("*.txt"):
-            try:
-                entries = parse_txt(read_txt(txt_path), txt_path)
-            except Exception as e:
-                error(f"  [!] Could not read {txt_path.name}: {e}")
-                skipped += 1
-                continue
+    try:
+        parsed = txt_tokenizer.parse(read_txt(txt_path))
+    except Exception as e:
+        messages.append(("error", f"  [!] Could not read {txt_path.name}: {e}"))
+        return Conversion(txt_path, json_path.name, "failed", 0, messages)
 
-            if not entries:
-                warn(f"  [!] No entries found in {txt_path.name} — skipped")
-                skipped += 1
-                continue
+    for diagnostic in parsed.diagnostics:
+        prefix = "  [~]" if diagnostic.level == txt_tokenizer.HANDLED else "  [!]"
+        messages.append((diagnostic.level, f"{prefix} {diagnostic.message} ({txt_path.name}:{diagnostic.line})"))
 
-            json_path = txt_path.parent / json_output_name(txt_path.stem)
-            entries   = strip_key_prefixes(entries, json_path.stem)
+    if not parsed.entries:
+        messages.append(("warning", f"  [!] No entries found in {txt_path.name} — skipped"))
+        return Conversion(txt_path, json_path.name, "empty", 0, messages)
 
-            try:
-                json_path.write_text(
-                    json.dumps(entries, indent=4, ensure_ascii=False),
-                    encoding="utf-8"
-                )
-                print(f"  {txt_path.name}  ->  {json_path.name}  ({len(entries)} keys)")
-                converted += 1
-            except Exception as e:
-                error(f"  [!] Could not write {json_path.name}: {e}")
-                skipped += 1
+    entries = strip_key_prefixes(parsed.entries, json_path.stem)
+    try:
+        written = write_json(json_path, entries.items())
+    except Exception as e:
+        messages.append(("error", f"  [!] Could not write {json_path.name}: {e}"))
+        return Conversion(txt_path, json_path.name, "failed", 0, messages)
+    return Conversion(txt_path, json_path.name, "converted" if written else "unchanged", len(entries), messages)
+
+
+REPORTERS = {
+    txt_tokenizer.HANDLED:   handled,
+    txt_tokenizer.MALFORMED: malformed,
+    txt_tokenizer.WARNING:   warn,
+    "error":                 error,
+}
 
-    print(f"\nDone — {converted} file(s) converted, {skipped} skipped.")
 
+def convert(root: Path, jobs: int = None, verbose: bool = False, force: bool = False,
+            scan_index: Path = None) -> dict:
+    """
+    Converts every .txt file below root's B42 Translate directories, in parallel over `jobs` processes.
+    Files are handled in sorted order and results are reported in that order, whatever the job count.
+    .txt files whose .json is newer are skipped unless `force` is set.
+    scan_index persists the directory walk between runs (see scanner.py).
+    """
+    start = time.perf_counter()
+    index = scanner.scan(root, scan_index)
+    b41   = index.translate_dirs(b41=True)
+    paths = sorted(
+        p for d in index.dirs.values() if not d.b41
+        for lang in d.languages for p in d.files(lang, ".txt")
+    )
+    jobs  = max(1, min(jobs or os.cpu_count() or 1, len(paths)))
+
+    if verbose:
+        for translate_dir in b41:
+            print(f"[B41 skipped]  {translate_dir}")
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        target = Path(__file__).parent
+    if jobs == 1:
+        results = map(convert_file, paths, repeat(force))
     else:
-        target = Path(sys.argv[1]).resolve()
+        pool    = ProcessPoolExecutor(max_workers=jobs)
+        results = pool.map(convert_file, paths, repeat(force), chunksize=max(1, len(paths) // (jobs * 8)))
+
+    counts  = dict.fromkeys(("converted", "unchanged", "up to date", "empty", "failed"), 0)
+    current = None
+    try:
+        for result in results:
+            counts[result.status] += 1
+            translate_dir = next(parent for parent in result.txt_path.parents if parent.name == "Translate")
+            if verbose and translate_dir != current:
+                current = translate_dir
+                print(f"\n[B42]  {translate_dir}")
+            for level, message in result.messages:
+                REPORTERS[level](message)
+            if verbose and result.status in ("converted", "unchanged"):
+                note = "" if result.status == "converted" else ", unchanged"
+                print(f"  {result.txt_path.name}  ->  {result.json_name}  ({result.keys} keys{note})")
+            elif verbose and result.status == "up to date":
+                print(f"  {result.txt_path.name}  —  {result.json_name} is newer, skipped")
+    finally:
+        if jobs > 1:
+            pool.shutdown()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"\nDone — {counts['converted']} file(s) converted, {counts['unchanged']} unchanged, "
+        f"{counts['up to date']} up to date, {counts['empty'] + counts['failed']} skipped  |  "
+        f"{len(index.dirs) - len(b41)} Translate dir(s), {len(b41)} B41 skipped  |  {jobs} job(s)  {elapsed:.1f}s"
+    )
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PZ Translation .txt to .json converter")
+    parser.add_argument("directory", nargs="?", default=str(Path(__file__).parent))
+    parser.add_argument("-jobs",    type=int, default=None)
+    parser.add_argument("-verbose", action="store_true")
+    parser.add_argument("-force",   action="store_true")
+    parser.add_argument("-scan-index", default=None)
+    args   = parser.parse_args()
+    target = Path(args.directory).resolve()
 
     if not target.is_dir():
         error(f"Invalid directory: {target}")
         sys.exit(1)
 
     print(f"Scanning: {target}\n")
-    convert(target)
+    convert(
+        target, jobs=args.jobs, verbose=args.verbose, force=args.force,
+        scan_index=Path(args.scan_index) if args.scan_index else None
+    )
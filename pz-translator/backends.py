@@ -0,0 +1,276 @@
+import re
+import time
+import asyncio
+import random
+import threading
+from contextlib import contextmanager
+
+
+class Backend:
+    """
+    A translation service. Implementations translate a batch of (already modulated) strings
+    from one backend language code to another and return the results in the same order.
+    Blocking implementations only provide translate_batch, which the scheduler runs on its backend
+    executor; backends with a native asyncio client override translate_batch_async instead.
+    max_chars / max_items bound a single request. packs_requests is False for clients that send one
+    HTTP request per string, where batching saves no requests and batch latency says nothing about the server.
+    """
+    name           = "backend"
+    fatal_errors   = ()
+    max_chars      = 5000
+    max_items      = 100
+    packs_requests = True
+
+    def translate_batch(self, source: str, target: str, texts: list) -> list:
+        raise NotImplementedError
+
+    async def translate_batch_async(self, source: str, target: str, texts: list, executor=None) -> list:
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, self.translate_batch, source, target, texts
+        )
+
+    def request_cost(self, texts: list) -> int:
+        """Number of requests a batch costs against the scheduler's rate limits."""
+        return 1
+
+    def supports(self, code: str) -> bool:
+        """Whether `code` is a language code the service accepts."""
+        return True
+
+    def close(self):
+        pass
+
+
+class ClientPool:
+    """
+    Reusable clients per key, typically (source, target). A leased client is used by one thread at a time;
+    it goes back to the pool afterwards, so a run creates about as many clients per pair as requests in flight.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.created = 0
+        self._idle   = {}
+        self._lock   = threading.Lock()
+
+    @contextmanager
+    def lease(self, key: tuple):
+        with self._lock:
+            idle   = self._idle.get(key)
+            client = idle.pop() if idle else None
+            if client is None:
+                self.created += 1
+        if client is None:
+            client = self.factory(*key)
+        try:
+            yield client
+        finally:
+            with self._lock:
+                self._idle.setdefault(key, []).append(client)
+
+
+class KeepAliveRequests:
+    """
+    requests.get() through one keep-alive Session per thread (connections are per host, so every language
+    pair a backend thread translates shares it) with a default timeout.
+    """
+    TIMEOUT = 30
+
+    def __init__(self, requests):
+        self._requests = requests
+        self._local    = threading.local()
+        self._sessions = []
+        self._lock     = threading.Lock()
+
+    def get(self, *args, **kwargs):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._requests.Session()
+            with self._lock:
+                self._sessions.append(session)
+        kwargs.setdefault("timeout", self.TIMEOUT)
+        return session.get(*args, **kwargs)
+
+    def close(self):
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+
+
+def keep_alive_google_translator(http: KeepAliveRequests):
+    """
+    A deep_translator GoogleTranslator whose translate() makes its HTTP call through `http`. The library
+    calls the module-level requests.get(), with no session or timeout, and offers no hook to change that;
+    the rest follows its GoogleTranslator.translate (1.11).
+    """
+    from bs4 import BeautifulSoup
+    from deep_translator import GoogleTranslator
+    from deep_translator.exceptions import RequestError, TooManyRequests, TranslationNotFound
+    from deep_translator.validate import is_empty, is_input_valid, request_failed
+
+    class KeepAliveGoogleTranslator(GoogleTranslator):
+        def translate(self, text: str, **kwargs) -> str:
+            is_input_valid(text, max_chars=5000)
+            text = text.strip()
+            if self._same_source_target() or is_empty(text):
+                return text
+            self._url_params["tl"] = self._target
+            self._url_params["sl"] = self._source
+            self._url_params[self.payload_key] = text
+
+            response = http.get(self._base_url, params=self._url_params, proxies=self.proxies)
+            if response.status_code == 429:
+                raise TooManyRequests()
+            if request_failed(status_code=response.status_code):
+                raise RequestError()
+            soup = BeautifulSoup(response.text, "html.parser")
+            response.close()
+
+            element = (soup.find(self._element_tag, self._element_query)
+                       or soup.find(self._element_tag, self._alt_element_query))
+            if not element:
+                raise TranslationNotFound(text)
+            return element.get_text(strip=True)
+
+    return KeepAliveGoogleTranslator
+
+
+class GoogleBackend(Backend):
+    """
+    deep_translator's GoogleTranslator keeps per-request state on the instance, so instances are leased
+    from a pool per language pair instead of being built for every batch, and its HTTP calls go through
+    keep-alive sessions (keep_alive_google_translator).
+    deep_translator sends one request per string, so batches are not packed adaptively (packs_requests).
+    """
+    name           = "google"
+    packs_requests = False
+
+    def __init__(self):
+        import requests
+        from deep_translator.constants import GOOGLE_LANGUAGES_TO_CODES
+        from deep_translator.exceptions import (
+            LanguageNotSupportedException, InvalidSourceOrTargetLanguage, NotValidPayload
+        )
+        self._http        = KeepAliveRequests(requests)
+        translator        = keep_alive_google_translator(self._http)
+        self._clients     = ClientPool(lambda source, target: translator(source=source, target=target))
+        self.fatal_errors = (LanguageNotSupportedException, InvalidSourceOrTargetLanguage, NotValidPayload)
+        self._codes       = set(GOOGLE_LANGUAGES_TO_CODES.values())
+
+    def translate_batch(self, source: str, target: str, texts: list) -> list:
+        with self._clients.lease((source, target)) as translator:
+            return translator.translate_batch(texts)
+
+    def request_cost(self, texts: list) -> int:
+        # deep_translator sends one HTTP request per string in a batch
+        return len(texts)
+
+    def supports(self, code: str) -> bool:
+        return code in self._codes
+
+    def close(self):
+        self._http.close()
+
+
+class MockBackendError(Exception):
+    pass
+
+
+class MockRateLimited(MockBackendError):
+    def __init__(self, retry_after: float):
+        super().__init__(f"mock throughput cap exceeded, retry after {retry_after:.2f}s")
+        self.retry_after = retry_after
+
+
+class MockBackend(Backend):
+    """
+    Offline backend for benchmarks, load tests and CI.
+    Pseudo-localises text deterministically (accented vowels, wrapped in [target|...]) and leaves
+    protected {n} sentinels untouched. Latency, error rate and server-side throughput caps are configurable;
+    exceeding a cap raises MockRateLimited with a retry_after, like a throttling HTTP API.
+    drop_rate makes it lose a sentinel now and then, like a real machine translator.
+    """
+    name = "mock"
+
+    ACCENTS   = str.maketrans("aeiouAEIOU", "áéíóúÁÉÍÓÚ")
+    PROTECTED = re.compile(r"\{[^}]*\}+")
+
+    def __init__(self, latency: float = 0.05, per_item: float = 0.0, error_rate: float = 0.0,
+                 max_rps: float = None, max_cps: float = None, drop_rate: float = 0.0, seed: int = 0):
+        self.latency    = latency
+        self.per_item   = per_item
+        self.error_rate = error_rate
+        self.max_rps    = max_rps
+        self.max_cps    = max_cps
+        self.drop_rate  = drop_rate
+        self._random    = random.Random(seed)
+        self._lock      = threading.Lock()
+        self._window    = (0, 0, 0)
+        self.calls      = 0
+        self.strings    = 0
+        self.characters = 0
+
+    def transform(self, target: str, text: str) -> str:
+        parts, last = [], 0
+        for match in self.PROTECTED.finditer(text):
+            parts.append(text[last:match.start()].translate(self.ACCENTS))
+            if not (self.drop_rate and self._random.random() < self.drop_rate):
+                parts.append(match.group())
+            last = match.end()
+        parts.append(text[last:].translate(self.ACCENTS))
+        return f"[{target}|{''.join(parts)}]"
+
+    def _admit(self, strings: int, chars: int):
+        with self._lock:
+            second           = int(time.monotonic())
+            start, req, used = self._window
+            if start != second:
+                req, used = 0, 0
+            req  += 1
+            used += chars
+            self._window = (second, req, used)
+
+            self.calls      += 1
+            self.strings    += strings
+            self.characters += chars
+            failed = self._random.random() < self.error_rate
+
+        over = (self.max_rps and req > self.max_rps) or (self.max_cps and used > self.max_cps)
+        if over:
+            raise MockRateLimited(retry_after=second + 1 - time.monotonic())
+        if failed:
+            raise MockBackendError("mock transient error")
+
+    def translate_batch(self, source: str, target: str, texts: list) -> list:
+        time.sleep(self.latency + self.per_item * len(texts))
+        self._admit(len(texts), sum(len(t) for t in texts))
+        return [self.transform(target, text) for text in texts]
+
+    async def translate_batch_async(self, source: str, target: str, texts: list, executor=None) -> list:
+        await asyncio.sleep(self.latency + self.per_item * len(texts))
+        self._admit(len(texts), sum(len(t) for t in texts))
+        return [self.transform(target, text) for text in texts]
+
+
+BACKENDS = {
+    GoogleBackend.name: GoogleBackend,
+    MockBackend.name:   MockBackend,
+}
+
+
+def create_backend(spec: str) -> Backend:
+    """
+    google
+    mock
+    mock:latency=0.2,error_rate=0.05,max_rps=20
+    """
+    name, _, options = spec.partition(":")
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}' (available: {', '.join(BACKENDS)})")
+
+    kwargs = {}
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        kwargs[key.strip()] = float(value) if "." in value or "e" in value.lower() else int(value)
+    return BACKENDS[name](**kwargs)
@@ -0,0 +1,72 @@
+import time
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+
+class Event(NamedTuple):
+    """
+    Progress of a translate_tree run, passed to its `progress` callback (from worker threads):
+
+        plan   strings / chars still to send to the backend, total (directory, file, language) units
+        cache  strings of `lang` already known from the cache or translation memory
+        batch  one backend request for `lang` came back with `strings` translations (`chars` sent)
+        failed strings of `lang` given up after retries
+        file   one unit written: `file` of `directory` for `lang`, `strings` newly translated
+        done   the run finished (or was cancelled)
+    """
+    kind:      str
+    lang:      str  = None
+    directory: Path = None
+    file:      str  = None
+    strings:   int  = 0
+    chars:     int  = 0
+    total:     int  = 0
+
+
+class ProgressTracker:
+    """Folds events into totals, throughput and an ETA; safe to feed from several threads."""
+
+    def __init__(self):
+        self.start      = time.perf_counter()
+        self.units      = 0
+        self.units_done = 0
+        self.chars      = 0
+        self.chars_done = 0
+        self.strings    = 0
+        self.cached     = 0
+        self.failed     = 0
+        self._lock      = threading.Lock()
+
+    def __call__(self, event: Event):
+        with self._lock:
+            if event.kind == "plan":
+                self.units = event.total
+                self.chars = event.chars
+            elif event.kind == "cache":
+                self.cached += event.strings
+            elif event.kind == "batch":
+                self.strings    += event.strings
+                self.chars_done += event.chars
+            elif event.kind == "failed":
+                self.failed += event.strings
+            elif event.kind == "file":
+                self.units_done += 1
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    @property
+    def strings_per_second(self) -> float:
+        return self.strings / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def eta(self) -> float | None:
+        """Seconds left, from the character throughput while sending and the unit rate afterwards."""
+        elapsed = self.elapsed
+        if self.chars_done and self.chars_done < self.chars:
+            return (self.chars - self.chars_done) * elapsed / self.chars_done
+        if self.units_done and self.units_done < self.units:
+            return (self.units - self.units_done) * elapsed / self.units_done
+        return None
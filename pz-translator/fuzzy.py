@@ -0,0 +1,68 @@
+import threading
+from placeholders import template, to_slots, fill
+
+
+class TemplateIndex:
+    """
+    Reuses translations of strings that differ only in their numbers and placeholders:
+
+        "Wait %1 for 5 minutes"  →  template "Wait {0} for \x1f minutes", numbers ("5",)
+        "Wait %1 for 10 minutes" →  same template, so the stored translation is reused with 10 filled in
+
+    Placeholders are already numbered sentinels in the protected texts this index works on; numbers become
+    slots here. Only translations where each source number appears exactly once are indexed, so a number is
+    never guessed. Entries come from the translation memory (loaded on first use per language pair) and
+    from translations received during the run.
+    """
+
+    def __init__(self, memory=None):
+        self.memory = memory
+        self._pairs = {}
+        self._lock  = threading.Lock()
+
+    def _pair(self, source_code: str, target_code: str) -> dict:
+        with self._lock:
+            pair = self._pairs.get((source_code, target_code))
+            if pair is not None:
+                return pair
+            pair = self._pairs[(source_code, target_code)] = {}
+            rows = []
+            if self.memory:
+                try:
+                    rows = self.memory.numbered(source_code, target_code)
+                except Exception as e:
+                    print(f"    [!] {target_code} — translation memory unavailable for templates: {e}")
+            self._index(pair, rows)
+            return pair
+
+    @staticmethod
+    def _index(pair: dict, rows):
+        for key, translation in rows:
+            shape, numbers = template(key)
+            if numbers and shape not in pair:
+                slotted = to_slots(translation, numbers)
+                if slotted is not None:
+                    pair[shape] = slotted
+
+    def add(self, source_code: str, target_code: str, translations: dict):
+        """Indexes fresh {protected text: protected translation} pairs."""
+        pair = self._pair(source_code, target_code)
+        with self._lock:
+            self._index(pair, translations.items())
+
+    def find(self, source_code: str, target_code: str, key: str) -> str | None:
+        """Protected translation of the protected text `key`, built from a stored template; None without one."""
+        shape, numbers = template(key)
+        if not numbers:
+            return None
+        slotted = self._pair(source_code, target_code).get(shape)
+        return fill(slotted, numbers) if slotted is not None else None
+
+    @staticmethod
+    def derive(key: str, translation: str, sibling: str) -> str | None:
+        """Translation of `sibling` (same template as `key`) from the translation of `key`; None if ambiguous."""
+        shape, numbers = template(key)
+        slotted        = to_slots(translation, numbers)
+        if slotted is None:
+            return None
+        return fill(slotted, template(sibling)[1])
@@ -0,0 +1,94 @@
+import os
+import json
+import threading
+from pathlib import Path
+
+
+class JobJournal:
+    """
+    Append-only JSON-lines record of a running job, written as work finishes:
+
+        {"type": "job",   "settings": {...}}
+        {"type": "dirs",  "dirs": [Translate directory, ...]}
+        {"type": "batch", "lang": "de", "translations": {source text: translation}}   (backend language code)
+        {"type": "unit",  "dir": Translate directory, "file": source file, "lang": "DE"}
+
+    Resuming replays the file: the directory list replaces the tree scan, batch results seed the
+    translation cache and completed (directory, file, language) units are not touched again.
+    The journal is removed once a job finishes cleanly.
+    """
+    FILE_NAME = ".pz-translator-job.jsonl"
+
+    def __init__(self, path: Path):
+        self.path      = path
+        self.settings  = {}
+        self.dirs      = None
+        self.completed = set()
+        self.batches   = {}
+        self._lock     = threading.Lock()
+        self._file     = None
+
+    @classmethod
+    def start(cls, path: Path, settings: dict) -> "JobJournal":
+        journal          = cls(path)
+        journal.settings = settings
+        journal._file    = open(path, "w", encoding="utf-8")
+        journal._append({"type": "job", "settings": settings})
+        return journal
+
+    @classmethod
+    def resume(cls, path: Path) -> "JobJournal":
+        journal = cls(path)
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn final line from an interrupted write
+                kind = record.get("type")
+                if kind == "job":
+                    journal.settings = record["settings"]
+                elif kind == "dirs":
+                    journal.dirs = [Path(d) for d in record["dirs"]]
+                elif kind == "batch":
+                    lang = record["lang"]
+                    for text, translation in record["translations"].items():
+                        journal.batches[(lang, text)] = translation
+                elif kind == "unit":
+                    journal.completed.add((record["dir"], record["file"], record["lang"]))
+        journal._file = open(path, "a", encoding="utf-8")
+        return journal
+
+    def _append(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file:
+                self._file.write(line)
+                self._file.flush()
+
+    def record_dirs(self, dirs: list):
+        self.dirs = list(dirs)
+        self._append({"type": "dirs", "dirs": [str(d) for d in dirs]})
+
+    def batch_done(self, lang: str, translations: dict):
+        if translations:
+            self._append({"type": "batch", "lang": lang, "translations": translations})
+
+    def unit_done(self, directory: Path, name: str, lang: str):
+        self.completed.add((str(directory), name, lang))
+        self._append({"type": "unit", "dir": str(directory), "file": name, "lang": lang})
+
+    def is_done(self, directory: Path, name: str, lang: str) -> bool:
+        return (str(directory), name, lang) in self.completed
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+
+    def finish(self):
+        self.close()
+        self.path.unlink(missing_ok=True)
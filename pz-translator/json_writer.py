@@ -0,0 +1,66 @@
+import os
+import json
+import threading
+from pathlib import Path
+
+CHUNK = 1 << 16
+
+
+def iter_json_object(items):
+    """
+    Encodes (key, value) pairs as a JSON object, piece by piece, byte-for-byte the same as
+    json.dumps(dict(items), indent=4, ensure_ascii=False).
+    """
+    separator = "{\n    "
+    for key, value in items:
+        encoded = json.dumps(value, indent=4, ensure_ascii=False).replace("\n", "\n    ")
+        yield f"{separator}{json.dumps(key, ensure_ascii=False)}: {encoded}"
+        separator = ",\n    "
+    yield "{}" if separator == "{\n    " else "\n}"
+
+
+def write_json(path: Path, items) -> bool:
+    """
+    Streams a JSON object to a temporary file next to `path`, fsyncs it and atomically replaces `path`,
+    so readers and concurrent writers only ever see a complete file.
+    The output is compared with the existing file as it is written; when they are byte-identical
+    the temporary file is dropped and `path` is left untouched. Returns whether `path` was replaced.
+    """
+    temp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        existing = open(path, "rb")
+    except OSError:
+        existing = None
+
+    same    = existing is not None
+    pending = []
+    size    = 0
+    try:
+        with open(temp, "wb") as out:
+            for piece in iter_json_object(items):
+                data = piece.encode("utf-8")
+                pending.append(data)
+                size += len(data)
+                if size >= CHUNK:
+                    block = b"".join(pending)
+                    same  = same and existing.read(len(block)) == block
+                    out.write(block)
+                    pending, size = [], 0
+            block = b"".join(pending)
+            same  = same and existing.read(len(block)) == block and not existing.read(1)
+            out.write(block)
+            if not same:
+                out.flush()
+                os.fsync(out.fileno())
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+    finally:
+        if existing:
+            existing.close()
+
+    if same:
+        temp.unlink(missing_ok=True)
+        return False
+    os.replace(temp, path)
+    return True
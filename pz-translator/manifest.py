@@ -0,0 +1,118 @@
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+
+
+def value_hash(value) -> str:
+    data = value if isinstance(value, str) else json.dumps(value, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """
+    Per-Translate-directory record of what each target language was translated from.
+
+    {
+        "sources":   {source file: {"mtime_ns", "size", "hash"}},
+        "languages": {lang: {source file: {"hash", "mtime_ns", "size", "keys": {key: value hash}}}}
+    }
+
+    Source files are re-hashed only when their mtime/size changed; a language is up to date for a
+    file when it was produced from the current source hash and its target file is untouched since.
+    Each shard keeps its own manifest, so shards running at once never overwrite each other's records.
+    """
+    FILE_NAME = ".pz-translator-manifest.json"
+    VERSION   = 1
+
+    def __init__(self, translate_path: Path, source_lang: str, shard=None):
+        name             = self.FILE_NAME if shard is None else f".pz-translator-manifest.{shard.index}-of-{shard.count}.json"
+        self.path        = translate_path / name
+        self.source_lang = source_lang
+        self.sources     = {}
+        self.languages   = {}
+        self._lock       = threading.Lock()
+        self._dirty      = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"    [!] Could not read {self.path.name}: {e} — starting a new manifest")
+            return
+        if data.get("version") != self.VERSION or data.get("source") != self.source_lang:
+            return
+        self.sources   = data.get("sources", {})
+        self.languages = data.get("languages", {})
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({
+                "version":   self.VERSION,
+                "source":    self.source_lang,
+                "sources":   self.sources,
+                "languages": self.languages,
+            }, indent=1, ensure_ascii=False, sort_keys=True)
+            self._dirty = False
+
+        temp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temp.write_text(data, encoding="utf-8")
+        os.replace(temp, self.path)
+
+    def source_hash(self, path: Path, name: str) -> str:
+        stat   = path.stat()
+        record = self.sources.get(name)
+        if record and record["mtime_ns"] == stat.st_mtime_ns and record["size"] == stat.st_size:
+            return record["hash"]
+
+        digest = file_hash(path)
+        with self._lock:
+            self.sources[name] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "hash": digest}
+            self._dirty = True
+        return digest
+
+    def is_current(self, name: str, lang: str, digest: str, dest_file: Path) -> bool:
+        record = self.languages.get(lang, {}).get(name)
+        if not record or record["hash"] != digest:
+            return False
+        try:
+            stat = dest_file.stat()
+        except OSError:
+            return False
+        return record["mtime_ns"] == stat.st_mtime_ns and record["size"] == stat.st_size
+
+    def stale_keys(self, name: str, lang: str, entries) -> set:
+        recorded = self.languages.get(lang, {}).get(name, {}).get("keys")
+        if recorded is None:
+            return set()
+        return {
+            key for key, value in entries.items()
+            if key in recorded and recorded[key] != value_hash(value)
+        }
+
+    def record(self, name: str, lang: str, digest: str, dest_file: Path, entries, keys, failed: set = ()):
+        """`failed` keys kept an older translation (or none): they stay stale and the unit is not current."""
+        stat = dest_file.stat()
+        with self._lock:
+            self.languages.setdefault(lang, {})[name] = {
+                "hash":     None if failed else digest,
+                "mtime_ns": stat.st_mtime_ns,
+                "size":     stat.st_size,
+                "keys":     {key: "" if key in failed else value_hash(entries[key]) for key in keys if key in entries},
+            }
+            self._dirty = True
@@ -0,0 +1,128 @@
+import json
+import time
+import bisect
+import platform
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+
+# bucket upper bounds: 10µs … ~1.5h
+BUCKETS = tuple(0.00001 * 2 ** i for i in range(30))
+
+
+class Histogram:
+    """Fixed exponential buckets plus count/sum/min/max; percentiles are bucket upper bounds."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count  = 0
+        self.total  = 0.0
+        self.min    = None
+        self.max    = None
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min    = value if self.min is None else min(self.min, value)
+        self.max    = value if self.max is None else max(self.max, value)
+
+    def percentile(self, fraction: float) -> float | None:
+        if not self.count:
+            return None
+        if fraction >= 1:
+            return self.max
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return round(min(BUCKETS[index], self.max), 6) if index < len(BUCKETS) else self.max
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum":   round(self.total, 6),
+            "min":   round(self.min, 6) if self.count else None,
+            "max":   round(self.max, 6) if self.count else None,
+            "mean":  round(self.total / self.count, 6) if self.count else None,
+            "p50":   self.percentile(0.50),
+            "p90":   self.percentile(0.90),
+            "p99":   self.percentile(0.99),
+        }
+
+
+class Metrics:
+    """
+    Thread-safe counters and histograms for one run, shared through the Scheduler.
+
+        metrics.count("backend.chars", 1200)
+        metrics.observe("backend.latency_s", 0.41)
+        with metrics.timer("time.write_s"): ...
+        with metrics.span("batch", lang="DE", strings=40): ...   # recorded only with trace=True
+
+    Names are dotted; *_s histograms are seconds.
+    """
+
+    def __init__(self, trace: bool = False):
+        self.trace      = trace
+        self.start      = time.perf_counter()
+        self.counters   = {}
+        self.histograms = {}
+        self.spans      = []
+        self._lock      = threading.Lock()
+
+    def count(self, name: str, amount: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, value: float):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Trace span: start offset and duration of one unit of work, with its attributes."""
+        start = time.perf_counter()
+        try:
+            yield attributes
+        finally:
+            if self.trace:
+                end = time.perf_counter()
+                with self._lock:
+                    self.spans.append({
+                        "name":       name,
+                        "start_s":    round(start - self.start, 6),
+                        "duration_s": round(end - start, 6),
+                        "thread":     threading.current_thread().name,
+                        **attributes,
+                    })
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            data = {
+                "elapsed_s":  round(time.perf_counter() - self.start, 3),
+                "python":     platform.python_version(),
+                "counters":   dict(sorted(self.counters.items())),
+                "histograms": {name: h.snapshot() for name, h in sorted(self.histograms.items())},
+            }
+            if self.trace:
+                data["spans"] = sorted(self.spans, key=lambda span: span["start_s"])
+        return data
+
+    def dump(self, path: Path, **extra):
+        data = self.snapshot()
+        data.update(extra)
+        Path(path).write_text(json.dumps(data, indent=1, ensure_ascii=False), encoding="utf-8")
@@ -0,0 +1,53 @@
+import threading
+
+DEFAULT_TARGET_LATENCY = 2.0
+
+
+class RequestPacker:
+    """
+    Packs strings into backend requests bounded by a character and an item budget.
+
+    The character budget adapts to what the backend does with it: a request that comes back
+    faster than target_latency grows the budget by a quarter (up to max_chars), a slow one
+    shrinks it by a quarter and a failed one halves it (down to min_chars).
+    A single string longer than the budget is sent on its own.
+
+    With adaptive=False the budget stays at max_chars. That is for backends whose client sends one HTTP
+    request per string anyway: a batch is only a unit of work there, and its latency grows with its size,
+    not with server pressure.
+    """
+
+    def __init__(self, max_chars: int, max_items: int, min_chars: int = 200,
+                 target_latency: float = DEFAULT_TARGET_LATENCY, adaptive: bool = True):
+        self.max_chars      = max_chars
+        self.max_items      = max_items
+        self.min_chars      = min(min_chars, max_chars)
+        self.target_latency = target_latency
+        self.adaptive       = adaptive
+        self.chars          = max(self.min_chars, max_chars // 4) if adaptive else max_chars
+        self._lock          = threading.Lock()
+
+    def batches(self, texts: list):
+        """Yields requests lazily, so each one is sized by the budget as it stands when it is taken."""
+        index = 0
+        while index < len(texts):
+            budget = self.chars
+            end    = index + 1
+            size   = len(texts[index])
+            while end < len(texts) and end - index < self.max_items and size + len(texts[end]) <= budget:
+                size += len(texts[end])
+                end  += 1
+            yield texts[index:end]
+            index = end
+
+    def record(self, chars: int, latency: float, failed: bool = False):
+        if not self.adaptive:
+            return
+        with self._lock:
+            if failed:
+                self.chars = max(self.min_chars, self.chars // 2)
+            elif latency > self.target_latency:
+                self.chars = max(self.min_chars, int(self.chars * 0.75))
+            elif chars >= self.chars // 2:
+                # only requests that actually used the budget say anything about a bigger one
+                self.chars = min(self.max_chars, int(self.chars * 1.25))
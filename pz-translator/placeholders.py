@@ -0,0 +1,72 @@
+import re
+
+# [img=x] [col=1,0,0] [/b] [br/] [b] are tags; in "Hammer [Broken]" only the brackets are protected
+BRACKET_TAG = r"\[(?:/[A-Za-z]\w*|[A-Za-z]\w*=[^\[\]\n]*|[A-Za-z]\w*/|[a-z][a-z0-9]?)\]"
+PLACEHOLDER = re.compile(rf"%\d+|%[sd]|<[A-Za-z/][^<>\n]*>|{BRACKET_TAG}|[\[\]]|\{{[^{{}}\n]*\}}")
+SENTINEL    = re.compile(r"\{\s*(\d+)\s*\}")
+
+
+def protect(text: str) -> tuple:
+    """
+    Replaces every placeholder, rich-text tag and square bracket with a numbered sentinel, in one pass:
+
+        "Press <RGB:1,0,0>%1<LINE> [img=x]" → ("Press {0}{1}{2} {3}", ("<RGB:1,0,0>", "%1", "<LINE>", "[img=x]"))
+
+    Literal {...} spans are protected too, so every {n} in a translation is one of ours.
+    """
+    spans = []
+
+    def swap(match):
+        spans.append(match.group())
+        return f"{{{len(spans) - 1}}}"
+
+    return PLACEHOLDER.sub(swap, text), tuple(spans)
+
+
+def restore(text: str, spans: tuple) -> str | None:
+    """Puts the protected spans back; None if any sentinel was lost, duplicated or invented by the backend."""
+    if not isinstance(text, str):
+        return None
+    if not spans:
+        return text if SENTINEL.search(text) is None else None
+
+    seen = []
+
+    def swap(match):
+        index = int(match.group(1))
+        seen.append(index)
+        return spans[index] if index < len(spans) else match.group()
+
+    restored = SENTINEL.sub(swap, text)
+    if sorted(seen) != list(range(len(spans))):
+        return None
+    return restored
+
+
+# standalone integers: not part of a word, a sentinel or a decimal ("5", "10" — not "B42", "{0}", "1.5")
+NUMBER = re.compile(r"(?<![\w{])(?<!\d[.,])\d+(?![\w}])(?![.,]\d)")
+SLOT   = re.compile("\x1f(\\d+)\x1f")
+
+
+def template(text: str) -> tuple:
+    """("Wait {0} for 5 minutes") → ("Wait {0} for \x1f minutes", ("5",)); numbers in order of appearance."""
+    numbers = tuple(NUMBER.findall(text))
+    return (NUMBER.sub("\x1f", text) if numbers else text), numbers
+
+
+def to_slots(translation: str, numbers: tuple) -> str | None:
+    """
+    Turns a translation of a numbered text into a reusable one: each source number becomes a slot.
+    None when that would be ambiguous — a number repeated in the source, or not found exactly once in the translation.
+    """
+    if not numbers or len(set(numbers)) != len(numbers):
+        return None
+    found = NUMBER.findall(translation)
+    if any(found.count(number) != 1 for number in numbers):
+        return None
+    index = {number: i for i, number in enumerate(numbers)}
+    return NUMBER.sub(lambda m: f"\x1f{index[m.group()]}\x1f" if m.group() in index else m.group(), translation)
+
+
+def fill(slotted: str, numbers: tuple) -> str:
+    return SLOT.sub(lambda m: numbers[int(m.group(1))], slotted)
@@ -0,0 +1,221 @@
+import os
+import json
+import time
+import asyncio
+from concurrent.futures import CancelledError
+from pathlib import Path
+from datetime import date
+
+
+class BudgetCheckpoint:
+    """
+    Carries a character budget across runs on the same day and remembers the work that did not fit,
+    so the next budgeted run continues with it before anything else.
+    """
+
+    def __init__(self, path: Path):
+        self.path      = path
+        self.day       = date.today().isoformat()
+        self.spent     = 0
+        self.remaining = []
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"    [!] Could not read {path.name}: {e} — starting a new checkpoint")
+            return
+        if data.get("day") == self.day:
+            self.spent = data.get("spent", 0)
+        self.remaining = [tuple(item) for item in data.get("remaining", [])]
+
+    def save(self, spent: int, remaining: list):
+        self.spent    += spent
+        self.remaining = remaining
+        temp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temp.write_text(json.dumps({
+            "day":       self.day,
+            "spent":     self.spent,
+            "remaining": [list(item) for item in remaining],
+        }, indent=1, ensure_ascii=False), encoding="utf-8")
+        os.replace(temp, self.path)
+
+
+class TranslationPlan:
+    """
+    Process-wide view of the pending work across every Translate directory.
+    Each unique (text, language) pair is translated once; the per-directory pass then
+    fans the results out to every destination file through the shared translation cache.
+    Languages with the same backend code (AR/ES, PT/PTBR) are planned as one: the first of them
+    carries the work and the others are filled from the cache, which is keyed by backend code.
+    """
+
+    def __init__(self, translators: list):
+        self.translators = translators
+        self.requested   = 0
+        self.cached      = 0
+        self.unique: dict[str, list] = {}
+        self.deferred: dict[str, list] = {}
+        self.occurrences = {}
+        self.owners      = {}
+        self.aliases     = {}
+
+    def build(self) -> "TranslationPlan":
+        start  = time.perf_counter()
+        unique = {}
+
+        futures = [(t, t.scheduler.submit(t.collect_pending)) for t in self.translators]
+        for translator, future in futures:
+            try:
+                pending = future.result()
+            except CancelledError:
+                continue
+            for lang, texts in pending.items():
+                self.requested += len(texts)
+                unique.setdefault(lang, {}).update(dict.fromkeys(texts))
+                for text in texts:
+                    key = (lang, text)
+                    self.occurrences[key] = self.occurrences.get(key, 0) + 1
+                    self.owners.setdefault(key, translator)
+
+        if self.translators:
+            codes = {}
+            for lang in list(unique):
+                first = codes.setdefault(self.translators[0]._get_tr_code(lang), lang)
+                if first == lang:
+                    continue
+                self.aliases[lang] = first
+                texts = unique.pop(lang)
+                unique[first].update(texts)
+                for text in texts:
+                    count = self.occurrences.pop((lang, text))
+                    self.occurrences[(first, text)] = self.occurrences.get((first, text), 0) + count
+                    self.owners.setdefault((first, text), self.owners.pop((lang, text)))
+
+        self.unique     = {lang: list(texts) for lang, texts in unique.items()}
+        self.build_time = time.perf_counter() - start
+        return self
+
+    @property
+    def unique_count(self) -> int:
+        return sum(len(texts) for texts in self.unique.values())
+
+    @property
+    def dedup_ratio(self) -> float:
+        total = self.unique_count + self.cached + sum(len(t) for t in self.deferred.values())
+        return self.requested / total if total else 1.0
+
+    def _chars(self, text: str) -> int:
+        return len(self.translators[0]._modulate(text))
+
+    def resolve_known(self):
+        """Drops strings already in the cache or translation memory; they cost nothing to fan out."""
+        if not self.translators:
+            return
+        translator = self.translators[0]
+        for lang, texts in self.unique.items():
+            known = translator.lookup_known(texts, lang)
+            self.cached     += len(known)
+            if known:
+                translator._emit("cache", lang=lang, strings=len(known))
+            self.unique[lang] = [text for text in texts if text not in known]
+        self.unique = {lang: texts for lang, texts in self.unique.items() if texts}
+
+    def apply_budget(self, budget: int, checkpoint: BudgetCheckpoint = None):
+        """
+        Keeps the highest-priority work that fits in the character budget and defers the rest.
+        Priority: work left over by the previous budgeted run, then strings used by the most
+        files, then language order. Stops at the first item that does not fit.
+        """
+        carried   = {item: i for i, item in enumerate(checkpoint.remaining)} if checkpoint else {}
+        languages = {lang: i for i, lang in enumerate(self.unique)}
+        items     = sorted(
+            ((lang, text) for lang, texts in self.unique.items() for text in texts),
+            key=lambda item: (
+                carried.get(item, len(carried)),
+                -self.occurrences.get(item, 1),
+                languages[item[0]],
+            )
+        )
+
+        available = budget - (checkpoint.spent if checkpoint else 0)
+        selected  = {}
+        for index, (lang, text) in enumerate(items):
+            cost = self._chars(text)
+            if cost > available:
+                for deferred_lang, deferred_text in items[index:]:
+                    self.deferred.setdefault(deferred_lang, []).append(deferred_text)
+                break
+            available -= cost
+            selected.setdefault(lang, []).append(text)
+
+        self.unique = selected
+
+    def report(self):
+        saved = self.requested - self.unique_count - sum(len(t) for t in self.deferred.values())
+        print(
+            f"\nPlan — {len(self.translators)} Translate dir(s)  |  {self.requested} string(s) requested"
+            f"  |  {self.unique_count} to translate  |  {self.cached} known"
+            f"  |  dedup {self.dedup_ratio:.2f}x ({saved} saved)   {self.build_time * 1000:.0f}ms"
+        )
+        if self.aliases:
+            shared = ", ".join(f"{alias} → {lang}" for alias, lang in self.aliases.items())
+            print(f"  Shared backend language — {shared} (translated once)")
+        if self.deferred:
+            deferred = sum(len(t) for t in self.deferred.values())
+            print(f"  Budget — {deferred} string(s) deferred to a later run")
+
+    def report_usage(self):
+        """API calls and memory hits of the whole run; the plan's work is shared, so it is not split per directory."""
+        api_calls   = sum(t.api_call_count for t in self.translators)
+        memory_hits = sum(t.memory_hits for t in self.translators)
+        print(f"\nAll Translate dirs — {api_calls} API call(s)  |  {memory_hits} memory hit(s)")
+
+    def report_costs(self):
+        if not self.translators:
+            return
+        backend = self.translators[0].backend
+        info    = self.translators[0].language_info
+        packer  = self.translators[0].scheduler.packer(backend)
+        roots   = [t.root for t in self.translators]
+        base    = Path(os.path.commonpath(roots)) if len(roots) > 1 else roots[0].parent
+
+        print(f"\n  {'Language':<32}  {'Strings':>8}  {'Chars':>10}  {'Calls':>7}")
+        total_chars = total_calls = 0
+        for lang, texts in self.unique.items():
+            chars = sum(self._chars(t) for t in texts)
+            calls = sum(map(backend.request_cost, packer.batches([self.translators[0]._modulate(t) for t in texts])))
+            total_chars += chars
+            total_calls += calls
+            print(f"  {lang:<6}  {info.get(lang, {}).get('text', ''):<24}  {len(texts):>8}  {chars:>10}  {calls:>7}")
+        print(f"  {'Total':<32}  {self.unique_count:>8}  {total_chars:>10}  {total_calls:>7}")
+
+        per_mod = {}
+        for lang, texts in self.unique.items():
+            for text in texts:
+                owner = self.owners[(lang, text)]
+                count, chars = per_mod.get(owner, (0, 0))
+                per_mod[owner] = (count + 1, chars + self._chars(text))
+
+        print(f"\n  {'Translate directory (first user of each string)':<56}  {'Strings':>8}  {'Chars':>10}")
+        for translator in self.translators:
+            count, chars = per_mod.get(translator, (0, 0))
+            if count:
+                label = str(translator.root.relative_to(base)) if translator.root != base else translator.root.name
+                print(f"  {label:<56}  {count:>8}  {chars:>10}")
+
+    def remaining_items(self) -> list:
+        return [(lang, text) for lang, texts in self.deferred.items() for text in texts]
+
+    def execute(self):
+        if not self.translators or not self.unique:
+            return
+
+        translator = self.translators[0]
+
+        async def translate_all():
+            await asyncio.gather(*(
+                translator.translate_async(texts, lang) for lang, texts in self.unique.items()
+            ))
+
+        translator.scheduler.run(translate_all())
@@ -0,0 +1,151 @@
+import os
+import json
+import time
+from pathlib import Path
+from typing import NamedTuple
+from json_writer import write_json
+
+DEFAULT_INDEX_PATH = Path.home() / ".pz-translator" / "scan_index.json"
+SOURCE_SUFFIXES    = (".json", ".txt")
+RACY_SECONDS       = 2.0  # directories modified this recently are always re-listed
+
+
+def is_b41_folder(path: Path) -> bool:
+    current = path
+    while current != current.parent:
+        if current.name.lower() == "mods":
+            return len(path.relative_to(current).parts) == 5
+        current = current.parent
+    return False
+
+
+def _mods_depth(path: Path) -> int | None:
+    """Number of path parts below the nearest ancestor named `mods`, None without one."""
+    for depth, current in enumerate((path, *path.parents)):
+        if current.name.lower() == "mods":
+            return depth
+    return None
+
+
+class TranslateDir(NamedTuple):
+    path:      Path
+    b41:       bool
+    languages: dict  # {language folder: (.json / .txt paths relative to it, sorted)}
+
+    def files(self, lang: str, suffix: str) -> list:
+        return [self.path / lang / name for name in self.languages.get(lang, ()) if name.lower().endswith(suffix)]
+
+
+class TreeIndex(NamedTuple):
+    root:    Path
+    dirs:    dict  # {Translate directory: TranslateDir}, sorted
+    listed:  int   # directories read with scandir
+    reused:  int   # directories taken from the persisted index
+
+    def translate_dirs(self, b41: bool = False) -> list:
+        return [d.path for d in self.dirs.values() if d.b41 == b41]
+
+    def get(self, path: Path) -> TranslateDir | None:
+        return self.dirs.get(path)
+
+
+def _load(index_path: Path) -> dict:
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def scan(root: Path, index_path: Path = None) -> TreeIndex:
+    """
+    Walks `root` once with os.scandir and indexes every `Translate` directory: whether it is a B41 one
+    and the .json / .txt files of each language folder.
+
+    With `index_path`, directory listings are persisted together with each directory's mtime. A directory
+    whose mtime is unchanged is not listed again, so re-scanning a large (or network) tree costs one stat
+    per directory. Directory mtimes change when entries are added, removed or renamed, which is all the
+    index records; file contents are never cached here.
+    """
+    root   = Path(root).resolve()
+    cached = _load(index_path) if index_path else {}
+    fresh  = {}
+    found  = {}
+    seen   = set()
+    listed = 0
+    reused = 0
+    racy   = time.time() - RACY_SECONDS
+
+    # (directory, parts below the nearest `mods`, (Translate dir, language folder, relative prefix) or None)
+    stack = [(root, _mods_depth(root), None)]
+    if root.name == "Translate":
+        found[root] = (stack[0][1] == 5, {})
+        stack[0]    = (root, stack[0][1], (root, None, ""))
+
+    while stack:
+        path, depth, owner = stack.pop()
+        key = str(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        if (stat.st_dev, stat.st_ino) in seen:
+            continue
+        seen.add((stat.st_dev, stat.st_ino))
+
+        entry = cached.get(key)
+        if entry is None or entry.get("mtime_ns") != stat.st_mtime_ns or stat.st_mtime > racy:
+            subdirs, files = [], []
+            try:
+                with os.scandir(path) as it:
+                    for item in it:
+                        try:
+                            if item.is_dir():
+                                subdirs.append(item.name)
+                            elif owner and item.name.lower().endswith(SOURCE_SUFFIXES):
+                                files.append(item.name)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+            entry   = {"mtime_ns": stat.st_mtime_ns, "dirs": sorted(subdirs), "files": sorted(files)}
+            listed += 1
+        else:
+            reused += 1
+        fresh[key] = entry
+
+        if owner and owner[1] is not None:
+            translate_dir, lang, prefix = owner
+            found[translate_dir][1][lang].extend(prefix + name for name in entry["files"])
+
+        for name in entry["dirs"]:
+            child       = path / name
+            child_depth = 0 if name.lower() == "mods" else None if depth is None else depth + 1
+            if owner is None:
+                child_owner = None
+                if name == "Translate":
+                    child_owner  = (child, None, "")
+                    found[child] = (child_depth == 5, {})
+            elif owner[1] is None:
+                child_owner = (owner[0], name, "")
+                found[owner[0]][1][name] = []
+            else:
+                child_owner = (owner[0], owner[1], f"{owner[2]}{name}/")
+            stack.append((child, child_depth, child_owner))
+
+    dirs = {
+        path: TranslateDir(path, b41, {lang: tuple(sorted(names)) for lang, names in sorted(languages.items())})
+        for path, (b41, languages) in sorted(found.items())
+    }
+
+    if index_path:
+        below = str(root) + os.sep
+        kept  = {k: v for k, v in cached.items() if k != str(root) and not k.startswith(below)}
+        kept.update(fresh)
+        try:
+            Path(index_path).parent.mkdir(parents=True, exist_ok=True)
+            write_json(Path(index_path), sorted(kept.items()))
+        except OSError as e:
+            print(f"[!] Could not save scan index {index_path}: {e}")
+
+    return TreeIndex(root, dirs, listed, reused)
@@ -0,0 +1,258 @@
+import time
+import random
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from packing import RequestPacker
+from metrics import Metrics
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_IO_WORKERS  = 4
+DEFAULT_RETRIES     = 5
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, bursts up to `capacity`.
+    Amounts larger than the capacity are taken in capacity-sized chunks.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate     = float(rate)
+        self.capacity = float(capacity or rate)
+        self._tokens  = self.capacity
+        self._stamp   = time.monotonic()
+        self._lock    = threading.Lock()
+
+    def _take(self, chunk: float) -> float:
+        """Takes `chunk` tokens and returns 0, or returns how long to wait until they are available."""
+        with self._lock:
+            now          = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp  = now
+            if self._tokens >= chunk:
+                self._tokens -= chunk
+                return 0.0
+            return (chunk - self._tokens) / self.rate
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        remaining = float(amount)
+        waited    = 0.0
+        while remaining > 0:
+            chunk = min(remaining, self.capacity)
+            delay = self._take(chunk)
+            if delay:
+                await asyncio.sleep(delay)
+                waited += delay
+            else:
+                remaining -= chunk
+        return waited
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff ("full jitter"): attempt n sleeps uniform(0, base * 2^n), capped at max_delay.
+    Rate-limit errors additionally trigger a cooldown that every request honours.
+    """
+
+    def __init__(self, attempts: int = DEFAULT_RETRIES, base_delay: float = 1.0,
+                 max_delay: float = 60.0, cooldown: float = 30.0, fatal: tuple = ()):
+        self.attempts   = attempts
+        self.base_delay = base_delay
+        self.max_delay  = max_delay
+        self.cooldown   = cooldown
+        self.fatal      = fatal
+
+    def should_retry(self, exc: Exception, attempt: int) -> bool:
+        return attempt < self.attempts and not isinstance(exc, self.fatal)
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def retry_after(self, exc: Exception) -> float | None:
+        explicit = getattr(exc, "retry_after", None)
+        if explicit:
+            return float(explicit)
+        message = str(exc).lower()
+        if type(exc).__name__ == "TooManyRequests" or "429" in message or "too many requests" in message:
+            return self.cooldown
+        return None
+
+
+class Cancelled(Exception):
+    """Raised by Scheduler.translate for a request still waiting for a slot when the run was cancelled."""
+
+
+class Scheduler:
+    """
+    One scheduler shared by every Translator in the process.
+
+    Backend requests are coroutines on a single asyncio event loop running in its own thread, bounded
+    per backend by an in-flight semaphore and by the request/character rate limits. Backends without
+    native async support run their blocking calls on a backend thread pool of the same size.
+    File work (parsing, diffing, writing a language's files) goes to a small I/O executor through
+    submit(); run() lets that synchronous code wait on a coroutine.
+    Each backend gets one RequestPacker, sized by its own limits unless batch_chars/batch_items override them.
+    `metrics` collects latency, volume and timing for the whole run (see metrics.py).
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                 rps: float = None, cps: float = None, retry: RetryPolicy = None,
+                 io_workers: int = DEFAULT_IO_WORKERS,
+                 batch_chars: int = None, batch_items: int = None, metrics: Metrics = None):
+        self.max_workers = max(1, max_workers)
+        self.metrics     = metrics or Metrics()
+        self.retry       = retry or RetryPolicy()
+        self.io_workers  = max(1, io_workers)
+        self._io         = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="pz-io")
+        self._storage    = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pz-store")
+        self._blocking   = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pz-backend")
+        self._requests   = TokenBucket(rps) if rps else None
+        self._characters = TokenBucket(cps) if cps else None
+        self._in_flight  = {}
+        self._packers    = {}
+        self.batch_chars = batch_chars
+        self.batch_items = batch_items
+
+        self._loop   = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="pz-engine", daemon=True)
+        self._thread.start()
+
+        self.cancelled  = threading.Event()
+        self._lock      = threading.Lock()
+        self._resume_at = 0.0
+        self.calls      = 0
+        self.characters = 0
+        self.throttled  = 0.0
+        self.retries    = 0
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """After cancel() nothing new runs: the returned Future is already cancelled."""
+        if not self.cancelled.is_set():
+            try:
+                return self._io.submit(fn, *args, **kwargs)
+            except RuntimeError:
+                if not self.cancelled.is_set():
+                    raise
+        future = Future()
+        future.cancel()
+        return future
+
+    def run(self, coro):
+        """Runs a coroutine on the engine loop and waits for its result. Not callable from the loop itself."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def offload(self, fn, *args):
+        """Runs blocking bookkeeping (translation memory, journal) without stalling the event loop."""
+        return await self._loop.run_in_executor(self._storage, fn, *args)
+
+    def packer(self, backend) -> RequestPacker:
+        with self._lock:
+            packer = self._packers.get(backend.name)
+            if packer is None:
+                packer = self._packers[backend.name] = RequestPacker(
+                    self.batch_chars or backend.max_chars, self.batch_items or backend.max_items,
+                    adaptive=backend.packs_requests
+                )
+        return packer
+
+    def cool_down(self, seconds: float):
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    async def backoff(self, exc: Exception, attempt: int):
+        cooldown = self.retry.retry_after(exc)
+        if cooldown:
+            self.cool_down(cooldown)
+        delay = self.retry.delay(attempt)
+        with self._lock:
+            self.retries   += 1
+            self.throttled += delay
+        self.metrics.count("backend.retries")
+        self.metrics.observe("backend.backoff_s", delay)
+        deadline = time.monotonic() + delay
+        while not self.cancelled.is_set() and time.monotonic() < deadline:
+            await asyncio.sleep(min(0.25, deadline - time.monotonic()))
+
+    async def translate(self, backend, source: str, target: str, texts: list) -> list:
+        unique = list(dict.fromkeys(texts))
+        if len(unique) < len(texts):
+            # identical strings in one batch are sent once
+            self.metrics.count("backend.deduped", len(texts) - len(unique))
+            translations = await self.translate(backend, source, target, unique)
+            if not translations or len(translations) != len(unique):
+                return translations
+            translated = dict(zip(unique, translations))
+            return [translated[text] for text in texts]
+
+        chars    = sum(len(t) for t in texts)
+        requests = backend.request_cost(texts)
+        waited   = 0.0
+        pause    = self._resume_at - time.monotonic()
+        if pause > 0:
+            await asyncio.sleep(pause)
+            waited += pause
+        if self._requests:
+            waited += await self._requests.acquire(requests)
+        if self._characters and chars:
+            waited += await self._characters.acquire(chars)
+
+        in_flight = self._in_flight.setdefault(backend.name, asyncio.Semaphore(self.max_workers))
+        packer    = self.packer(backend)
+        metrics   = self.metrics
+        async with in_flight:
+            if self.cancelled.is_set():
+                raise Cancelled()
+            with self._lock:
+                self.calls      += requests
+                self.characters += chars
+                self.throttled  += waited
+            metrics.count("backend.requests", requests)
+            metrics.count("backend.strings", len(texts))
+            metrics.count("backend.chars", chars)
+            if waited:
+                metrics.observe("backend.throttled_s", waited)
+
+            with metrics.span("batch", backend=backend.name, target=target, strings=len(texts), chars=chars) as span:
+                start = time.monotonic()
+                try:
+                    translations = await backend.translate_batch_async(source, target, texts, self._blocking)
+                except Exception as e:
+                    latency = time.monotonic() - start
+                    span["error"] = type(e).__name__
+                    packer.record(chars, latency, failed=True)
+                    metrics.count("backend.errors")
+                    metrics.observe("backend.latency_s", latency)
+                    raise
+        latency = time.monotonic() - start
+        packer.record(chars, latency)
+        metrics.observe("backend.latency_s", latency)
+        return translations
+
+    def shutdown(self):
+        self._io.shutdown(wait=True)
+        self._storage.shutdown(wait=True)
+        self._blocking.shutdown(wait=True)
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+
+    def cancel(self):
+        """
+        Stops at the next batch boundary: requests already sent complete (and are kept), nothing new is sent
+        and queued file work is dropped. Units already being written finish and are journaled.
+        """
+        self.cancelled.set()
+        self._io.shutdown(wait=False, cancel_futures=True)
+
+    def reset(self):
+        """Makes a cancelled scheduler usable again, for long-lived processes that run job after job."""
+        if self.cancelled.is_set():
+            self._io = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="pz-io")
+            self.cancelled.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
@@ -0,0 +1,422 @@
+import sys
+import json
+import queue
+import socket
+import argparse
+import ipaddress
+import itertools
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+from contextlib import redirect_stdout
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from translate import translate_tree
+from backends import create_backend
+from scheduler import Scheduler, RetryPolicy, DEFAULT_MAX_WORKERS, DEFAULT_RETRIES
+from translation_memory import TranslationMemory, default_memory_path
+from scanner import DEFAULT_INDEX_PATH
+from shard import Shard
+from events import Event
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+KEEP_FINISHED   = 50
+MAX_CACHED      = 200_000  # translations kept warm per source language; the memory keeps the rest
+
+JOB_SETTINGS = {
+    "directory":   None,
+    "languages":   [],
+    "source":      "EN",
+    "overwrite":   False,
+    "incremental": False,
+    "fuzzy":       False,
+    "tr_code":     {},
+    "dry_run":     False,
+    "shard":       None,
+    "priority":    0,
+}
+
+
+class Job:
+    """
+    One queued translate_tree run. Everything it reports — engine events and printed lines — is kept
+    as a list of records that any number of clients can stream, from the start, while it runs.
+
+        {"kind": "log",  "text": "..."}
+        {"kind": "plan" | "cache" | "batch" | "failed" | "file" | "done", ...}   (events.Event fields)
+        {"kind": "end",  "status": "done" | "failed" | "cancelled"}
+    """
+
+    def __init__(self, job_id: int, settings: dict):
+        self.id       = job_id
+        self.settings = settings
+        self.status   = "queued"
+        self.records  = []
+        self._changed = threading.Condition()
+
+    def publish(self, record: dict):
+        with self._changed:
+            self.records.append(record)
+            self._changed.notify_all()
+
+    def on_event(self, event: Event):
+        record = event._asdict()
+        if record["directory"] is not None:
+            record["directory"] = str(record["directory"])
+        self.publish(record)
+
+    def finish(self, status: str):
+        self.status = status
+        self.publish({"kind": "end", "status": status})
+
+    def stream(self):
+        sent = 0
+        while True:
+            with self._changed:
+                while sent == len(self.records):
+                    self._changed.wait()
+                records = self.records[sent:]
+            sent += len(records)
+            yield from records
+            if records[-1]["kind"] == "end":
+                return
+
+    def summary(self) -> dict:
+        return {"id": self.id, "status": self.status, **self.settings}
+
+
+class JobLog:
+    """stdout replacement that publishes each printed line as a log record of the running job."""
+
+    def __init__(self, job: Job):
+        self.job     = job
+        self._buffer = ""
+
+    def write(self, text: str) -> int:
+        *lines, self._buffer = (self._buffer + text).split("\n")
+        for line in lines:
+            self.job.publish({"kind": "log", "text": line})
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+class TranslationServer:
+    """
+    Long-lived engine for `translate.py serve`. One backend (with its keep-alive sessions), one translation
+    memory, one scheduler (so one rate-limit budget) and the directory index stay warm across jobs, and
+    translations stay in a per-source-language cache (the oldest are dropped beyond MAX_CACHED). Jobs run
+    one at a time, highest priority first, in submission order within a priority.
+    """
+
+    def __init__(self, backend, memory: TranslationMemory = None, scheduler: Scheduler = None,
+                 scan_index: Path = DEFAULT_INDEX_PATH):
+        self.backend    = backend
+        self.memory     = memory
+        self.scheduler  = scheduler or Scheduler(retry=RetryPolicy(fatal=backend.fatal_errors))
+        self.scan_index = scan_index
+        self.jobs       = {}
+        self.current    = None
+        self._caches    = {}
+        self._ids       = itertools.count(1)
+        self._queue     = queue.PriorityQueue()
+        self._lock      = threading.Lock()
+        self._worker    = threading.Thread(target=self._work, name="pz-jobs", daemon=True)
+        self._worker.start()
+
+    def submit(self, settings: dict) -> Job:
+        unknown = set(settings) - set(JOB_SETTINGS)
+        if unknown:
+            raise ValueError(f"Unknown job setting(s): {', '.join(sorted(unknown))}")
+        settings = {**JOB_SETTINGS, **settings}
+        if not settings["directory"] or not Path(settings["directory"]).is_dir():
+            raise ValueError(f"Invalid directory: {settings['directory']}")
+        if settings["shard"]:
+            Shard.parse(settings["shard"], settings["directory"])
+        unsupported = [code for code in settings["tr_code"].values() if not self.backend.supports(code)]
+        if unsupported:
+            raise ValueError(f"Not a {self.backend.name} language code: {', '.join(unsupported)}")
+
+        with self._lock:
+            job = Job(next(self._ids), settings)
+            self.jobs[job.id] = job
+            finished = [j for j in self.jobs.values() if j.status in ("done", "failed", "cancelled")]
+            for old in finished[:max(0, len(finished) - KEEP_FINISHED)]:
+                del self.jobs[old.id]
+        self._queue.put((-int(settings["priority"]), job.id, job))
+        return job
+
+    def cancel(self, job: Job):
+        with self._lock:
+            if job.status == "queued":
+                job.finish("cancelled")
+            elif job is self.current:
+                self.scheduler.cancel()
+
+    def stop(self):
+        if self.current:
+            self.scheduler.cancel()
+        self._queue.put((float("-inf"), 0, None))
+        self._worker.join()
+        self.scheduler.shutdown()
+        self.backend.close()
+        if self.memory:
+            self.memory.close()
+
+    def _work(self):
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                return
+            with self._lock:
+                if job.status != "queued":
+                    continue
+                job.status   = "running"
+                self.current = job
+            self._run(job)
+            with self._lock:
+                self.current = None
+
+    def _run(self, job: Job):
+        settings  = job.settings
+        directory = Path(settings["directory"]).resolve()
+        cache     = self._caches.setdefault(settings["source"], {})
+        self.scheduler.reset()
+        try:
+            with redirect_stdout(JobLog(job)):
+                translate_tree(
+                    directory, settings["languages"],
+                    source_lang=settings["source"],
+                    skip_existing=not settings["overwrite"],
+                    incremental=settings["incremental"],
+                    backend=self.backend,
+                    memory=self.memory,
+                    scheduler=self.scheduler,
+                    dry_run=settings["dry_run"],
+                    progress=job.on_event,
+                    scan_index=self.scan_index,
+                    fuzzy=settings["fuzzy"],
+                    tr_codes=settings["tr_code"],
+                    cache=cache,
+                    shard=Shard.parse(settings["shard"], directory) if settings["shard"] else None
+                )
+            status = "cancelled" if self.scheduler.cancelled.is_set() else "done"
+        except Exception as e:
+            job.publish({"kind": "log", "text": f"[!] Job failed: {e}"})
+            status = "failed"
+        for key in list(itertools.islice(cache, max(0, len(cache) - MAX_CACHED))):
+            del cache[key]
+        job.finish(status)
+
+    def stats(self) -> dict:
+        return {
+            "jobs":      {status: sum(1 for j in self.jobs.values() if j.status == status)
+                          for status in ("queued", "running", "done", "failed", "cancelled")},
+            "cached":    {source: len(cache) for source, cache in self._caches.items()},
+            "requests":  self.scheduler.calls,
+            "chars":     self.scheduler.characters,
+            "backend":   self.backend.name,
+            "metrics":   self.scheduler.metrics.snapshot()["counters"],
+        }
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /jobs               {settings} → {"id": ...}
+    GET  /jobs               all jobs
+    GET  /jobs/<id>          one job
+    GET  /jobs/<id>/events   JSON lines, streamed until the job ends
+    POST /jobs/<id>/cancel
+    GET  /stats
+    """
+    server_version = "pz-translator"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _job(self, parts: list) -> Job | None:
+        try:
+            job = self.server.app.jobs.get(int(parts[1]))
+        except ValueError:
+            job = None
+        if job is None:
+            self._send(404, {"error": "no such job"})
+        return job
+
+    def do_GET(self):
+        app   = self.server.app
+        parts = self.path.strip("/").split("/")
+        if parts == ["stats"]:
+            return self._send(200, app.stats())
+        if parts == ["jobs"]:
+            return self._send(200, [job.summary() for job in list(app.jobs.values())])
+        if parts[0] != "jobs" or len(parts) not in (2, 3) or (len(parts) == 3 and parts[2] != "events"):
+            return self._send(404, {"error": "not found"})
+
+        job = self._job(parts)
+        if job is None:
+            return
+        if len(parts) == 2:
+            return self._send(200, job.summary())
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.end_headers()
+        try:
+            for record in job.stream():
+                self.wfile.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        self.close_connection = True
+
+    def do_POST(self):
+        app   = self.server.app
+        parts = self.path.strip("/").split("/")
+        if parts == ["jobs"]:
+            try:
+                length   = int(self.headers.get("Content-Length", 0))
+                settings = json.loads(self.rfile.read(length) or b"{}")
+                job      = app.submit(settings)
+            except (ValueError, TypeError) as e:
+                return self._send(400, {"error": str(e)})
+            return self._send(200, {"id": job.id})
+        if len(parts) == 3 and parts[0] == "jobs" and parts[2] == "cancel":
+            job = self._job(parts)
+            if job is not None:
+                app.cancel(job)
+                self._send(200, job.summary())
+            return
+        self._send(404, {"error": "not found"})
+
+
+def serve(app: TranslationServer, address: str = DEFAULT_ADDRESS) -> ThreadingHTTPServer:
+    """
+    Listens on a loopback address only: there is no authentication, and a job writes translations into
+    whatever directory it names.
+    """
+    host, _, port = address.rpartition(":")
+    host = host or "127.0.0.1"
+    if not ipaddress.ip_address(socket.getaddrinfo(host, None)[0][4][0]).is_loopback:
+        raise ValueError(f"{host} is not a loopback address — the server only accepts local clients")
+    httpd = ThreadingHTTPServer((host, int(port)), RequestHandler)
+    httpd.daemon_threads = True
+    httpd.app            = app
+    return httpd
+
+
+# client side — used by `translate.py -server` and the GUI
+
+def _call(address: str, method: str, path: str, body: dict = None, timeout: float = 10):
+    data    = None if body is None else json.dumps(body).encode("utf-8")
+    request = urllib.request.Request(
+        f"http://{address}{path}", data=data, method=method, headers={"Content-Type": "application/json"}
+    )
+    return urllib.request.urlopen(request, timeout=timeout)
+
+
+def is_running(address: str = DEFAULT_ADDRESS) -> bool:
+    try:
+        with _call(address, "GET", "/stats", timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+def submit_job(address: str, settings: dict) -> int:
+    try:
+        with _call(address, "POST", "/jobs", settings) as response:
+            return json.load(response)["id"]
+    except urllib.error.HTTPError as e:
+        raise ValueError(json.load(e).get("error", str(e))) from None
+
+
+def cancel_job(address: str, job_id: int):
+    with _call(address, "POST", f"/jobs/{job_id}/cancel", {}):
+        pass
+
+
+def job_records(address: str, job_id: int):
+    """Yields the job's records as they are produced, ending with its {"kind": "end"} record."""
+    with _call(address, "GET", f"/jobs/{job_id}/events", timeout=None) as response:
+        for line in response:
+            yield json.loads(line)
+
+
+def run_client(address: str, settings: dict) -> int:
+    """Submits a job, prints its output as it arrives and returns an exit code. Ctrl-C cancels the job."""
+    job_id = submit_job(address, settings)
+    print(f"Job {job_id} queued on {address}")
+    status = None
+    try:
+        for record in job_records(address, job_id):
+            if record["kind"] == "log":
+                print(record["text"])
+            elif record["kind"] == "end":
+                status = record["status"]
+    except KeyboardInterrupt:
+        cancel_job(address, job_id)
+        print(f"\nJob {job_id} cancelled")
+        return 130
+    print(f"\nJob {job_id} {status}")
+    return 0 if status == "done" else 1
+
+
+def to_event(record: dict) -> Event:
+    if record.get("directory") is not None:
+        record = {**record, "directory": Path(record["directory"])}
+    return Event(**record)
+
+
+def main(argv: list):
+    parser = argparse.ArgumentParser(prog="translate.py serve", description="PZ Translation daemon")
+    parser.add_argument("-address",     default=DEFAULT_ADDRESS)
+    parser.add_argument("-backend",     default="google")
+    parser.add_argument("-memory",      default=None)
+    parser.add_argument("-no-memory",   action="store_true")
+    parser.add_argument("-max-workers", type=int, default=DEFAULT_MAX_WORKERS)
+    parser.add_argument("-rps",         type=float, default=None)
+    parser.add_argument("-cps",         type=float, default=None)
+    parser.add_argument("-retries",     type=int, default=DEFAULT_RETRIES)
+    parser.add_argument("-scan-index",  default=str(DEFAULT_INDEX_PATH))
+    args = parser.parse_args(argv)
+
+    try:
+        backend = create_backend(args.backend)
+    except (ValueError, TypeError, ImportError) as e:
+        print(f"Invalid backend '{args.backend}': {e}")
+        sys.exit(1)
+
+    memory    = None if args.no_memory else TranslationMemory(
+        Path(args.memory) if args.memory else default_memory_path(backend.name)
+    )
+    scheduler = Scheduler(
+        args.max_workers, rps=args.rps, cps=args.cps,
+        retry=RetryPolicy(args.retries, fatal=backend.fatal_errors)
+    )
+    app = TranslationServer(backend, memory, scheduler, Path(args.scan_index))
+    try:
+        httpd = serve(app, args.address)
+    except (OSError, ValueError) as e:
+        print(f"Could not listen on {args.address}: {e}")
+        app.stop()
+        sys.exit(1)
+
+    print(f"Serving on http://{args.address}  |  Backend: {backend.name}  |  Ctrl-C to stop")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping")
+    finally:
+        httpd.server_close()
+        app.stop()
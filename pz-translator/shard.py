@@ -0,0 +1,38 @@
+import hashlib
+from pathlib import Path
+from typing import NamedTuple
+
+
+class Shard(NamedTuple):
+    """
+    One of `count` disjoint slices (numbered from 1) of a run's (Translate directory, file, language) units.
+    A unit belongs to the shard picked by a hash of its directory relative to the base directory, its
+    source file and its language. Processes or hosts given the same tree agree on the split without
+    talking to each other, wherever the tree is checked out.
+    """
+    index: int
+    count: int
+    base:  Path
+
+    @classmethod
+    def parse(cls, spec: str, base: Path) -> "Shard":
+        """2/4 → the second of four shards"""
+        index, _, count = spec.partition("/")
+        try:
+            index, count = int(index), int(count)
+        except ValueError:
+            raise ValueError(f"expected i/N, got {spec}") from None
+        if not 1 <= index <= count:
+            raise ValueError(f"expected i/N with 1 <= i <= N, got {spec}")
+        return cls(index, count, Path(base))
+
+    def owns(self, translate_dir: Path, name: str, lang: str) -> bool:
+        try:
+            directory = Path(translate_dir).relative_to(self.base).as_posix()
+        except ValueError:
+            directory = Path(translate_dir).as_posix()
+        digest = hashlib.blake2b(f"{directory}\0{name}\0{lang}".encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % self.count == self.index - 1
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
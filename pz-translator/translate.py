@@ -2,42 +2,36 @@ import re
 import sys
 import json
 import time
+import asyncio
 import argparse
+import threading
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from deep_translator import GoogleTranslator
-
-sys.stdout.reconfigure(encoding="utf-8")
+from types import MappingProxyType
+from typing import NamedTuple
+from concurrent.futures import CancelledError, Future
+from backends import Backend, GoogleBackend, create_backend
+from translation_memory import TranslationMemory, default_memory_path
+from planner import TranslationPlan, BudgetCheckpoint
+from scheduler import Scheduler, RetryPolicy, Cancelled, DEFAULT_MAX_WORKERS, DEFAULT_RETRIES
+from manifest import Manifest
+from journal import JobJournal
+from placeholders import protect, restore, template
+from json_writer import write_json
+import txt_tokenizer
+from events import Event
+from metrics import Metrics
+import scanner
+import watcher
+from fuzzy import TemplateIndex
+from shard import Shard
 
 def parse_txt(text: str, source_path: Path = None) -> dict:
-    match = re.search(r"\{(.*)\}", text, re.DOTALL)
-    if not match:
-        return {}
-
-    entries = {}
-    for line in match.group(1).splitlines():
-        line = line.strip()
-        if not line or line.startswith("--") or "=" not in line:
-            continue
-        key, value = line.split("=", 1)
-        key   = key.strip()
-        value = value.strip()
-
-        if value.startswith('"'):
-            close = value.find('"', 1)
-            while close != -1 and value[close - 1] == '\\':
-                close = value.find('"', close + 1)
-            if close == -1:
-                name = source_path.name if source_path else '?'
-                print(f"    [!] No closing quote for '{key}' in {name} — used as-is")
-                value = value[1:].replace('\\"', '"')
-            else:
-                value = value[1:close].replace('\\"', '"')
-
-        if key in entries and source_path:
-            print(f"    [!] Duplicate key '{key}' in {source_path.name}")
-        entries[key] = value
-    return entries
+    parsed = txt_tokenizer.parse(text)
+    name   = source_path.name if source_path else "?"
+    for diagnostic in parsed.diagnostics:
+        if diagnostic.level != txt_tokenizer.HANDLED:
+            print(f"    [!] {name}:{diagnostic.line} — {diagnostic.message}")
+    return parsed.entries
 
 
 def json_output_name(txt_stem: str, language_info: dict) -> str:
@@ -69,256 +63,760 @@ def strip_key_prefixes(entries: dict, json_stem: str) -> dict:
     }
 
 
+class SourceFile(NamedTuple):
+    path:    Path
+    name:    str
+    dest:    Path
+    entries: MappingProxyType
+    digest:  str | None = None
+
+
 class Translator:
     QUOTED_TEXT_REGEX = re.compile(r'"([^"]+)"')
-    TAG_MODULATION = [
-        ("<",  "{<{"), (">",  "}>}"),
-        ("[",  "{[{"), ("]",  "}]}"),
-        ("%1", "{%1}"), ("%2", "{%2}"), ("%3", "{%3}"),
-        ("%4", "{%4}"), ("%5", "{%5}"),
-    ]
 
     def __init__(self, translate_path: Path, enabled_languages: list,
-                 source_lang: str = "EN", skip_existing: bool = True):
-        self.root           = translate_path
+                 source_lang: str = "EN", skip_existing: bool = True,
+                 memory: TranslationMemory = None, cache: dict = None,
+                 scheduler: Scheduler = None, incremental: bool = False,
+                 backend: Backend = None, journal: JobJournal = None, progress=None,
+                 index: scanner.TreeIndex = None, templates: TemplateIndex = None,
+                 tr_codes: dict = None, shard: Shard = None):
+        self.root           = Path(translate_path).resolve()
         self.source_lang    = source_lang
         self.skip_existing  = skip_existing
+        self.memory         = memory
+        self.backend        = backend or GoogleBackend()
+        self.scheduler      = scheduler or Scheduler(retry=RetryPolicy(fatal=self.backend.fatal_errors))
+        self.metrics        = self.scheduler.metrics
         self.api_call_count = 0
+        self.memory_hits    = 0
+        self._counts_lock   = threading.Lock()
 
         self.language_info = self._load_language_info()
+        self.tr_codes      = {lang: info.get("tr_code", lang.lower()) for lang, info in self.language_info.items()}
+        self.tr_codes.update(tr_codes or {})
         self.languages = [
             lang for lang in self.language_info
             if lang != self.source_lang and (not enabled_languages or lang in enabled_languages)
         ]
-        self.translation_cache = {}
-
-    @staticmethod
-    def is_b41_folder(path: Path) -> bool:
-        current = path
-        while current != current.parent:
-            if current.name.lower() == "mods":
-                return len(path.relative_to(current).parts) == 5
-            current = current.parent
-        return False
+        self.translation_cache = {} if cache is None else cache
+        self.manifest          = Manifest(self.root, source_lang, shard) if incremental else None
+        self.unchanged_files   = 0
+        self.allow_backend     = True
+        self.journal           = journal
+        self.progress          = progress
+        self.index             = index
+        self.templates         = templates
+        self.shard             = shard
+        self._sources          = None
+
+    is_b41_folder = staticmethod(scanner.is_b41_folder)
 
     def _load_language_info(self) -> dict:
         with open(Path(__file__).parent / "LanguagesInfo_b42.json", "r", encoding="utf-8") as f:
             return json.load(f)
 
     def _get_tr_code(self, lang: str) -> str:
-        return self.language_info.get(lang, {}).get("tr_code", lang.lower())
+        """Backend language code. Languages sharing one (AR/ES, PT/PTBR) share their translations."""
+        return self.tr_codes.get(lang, lang.lower())
 
     def _get_translation_path(self, lang_id: str) -> Path:
         return self.root / lang_id
 
+    def _emit(self, kind: str, **fields):
+        if self.progress:
+            self.progress(Event(kind, **fields))
+
     def _modulate(self, text: str) -> str:
-        for k, v in self.TAG_MODULATION:
-            text = text.replace(k, v)
-        return text
+        return protect(text)[0]
 
-    def _demodulate(self, text: str) -> str:
-        for k, v in self.TAG_MODULATION:
-            text = text.replace(v, k)
-        return text
+    def _load_existing(self, dest_file: Path, always: bool = False) -> dict:
+        if not (self.skip_existing or always) or not dest_file.exists():
+            return {}
+        try:
+            data = dest_file.read_bytes()
+            self.metrics.count("io.bytes_read", len(data))
+            return json.loads(data.decode("utf-8-sig"))
+        except Exception:
+            return {}
 
-    def _batch_translate(self, texts: list, lang: str) -> dict | None:
-        if not texts:
+    def _preserved_keys(self, src: SourceFile, lang: str, existing: dict) -> set:
+        if not self.skip_existing:
+            return set()
+        preserved = {key for key in src.entries if key in existing}
+        if self.manifest:
+            preserved -= self.manifest.stale_keys(src.name, lang, src.entries)
+        return preserved
+
+    def _pending_values(self, entries, preserved: set) -> list:
+        return [
+            value for key, value in entries.items()
+            if isinstance(value, str) and value.strip() and key not in preserved
+        ]
+
+    def _is_unchanged(self, name: str, dest: Path, digest: str) -> bool:
+        return self.skip_existing and all(
+            self.manifest.is_current(name, lang, digest, self._get_translation_path(lang) / dest)
+            for lang in self.languages if self.in_shard(name, lang)
+        )
+
+    def in_shard(self, name: str, lang: str) -> bool:
+        """Whether this process translates source file `name` into `lang` (always, unless sharded)."""
+        return self.shard is None or self.shard.owns(self.root, name, lang)
+
+    def _load_sources(self) -> tuple:
+        """
+        Parses the source language folder once per Translator; every language worker shares the result.
+        JSON sources take precedence; pre-42.15 .txt sources are converted to their .json names.
+        In incremental mode, files already translated for every language are skipped without being opened.
+        """
+        if self._sources is not None:
+            return self._sources
+
+        source_path = self._get_translation_path(self.source_lang)
+        listing     = (self.index or scanner.scan(self.root)).get(self.root)
+        json_files  = listing.files(self.source_lang, ".json") if listing else []
+        txt_files   = [] if json_files or not listing else listing.files(self.source_lang, ".txt")
+        sources     = []
+
+        for src_file in json_files + txt_files:
+            digest = None
+            if self.manifest:
+                name = src_file.relative_to(source_path).as_posix()
+                dest = self._dest_path(src_file)
+                try:
+                    digest = self.manifest.source_hash(src_file, name)
+                except OSError as e:
+                    print(f"    [!] Could not read {src_file.name}: {e}")
+                    continue
+                if self._is_unchanged(name, dest, digest):
+                    self.unchanged_files += 1
+                    continue
+            src = self.parse_source(src_file, digest)
+            if src is not None:
+                sources.append(src)
+
+        self._sources = tuple(sources)
+        return self._sources
+
+    def _dest_path(self, src_file: Path) -> Path:
+        if src_file.suffix.lower() == ".json":
+            return src_file.relative_to(self._get_translation_path(self.source_lang))
+        return Path(json_output_name(src_file.stem, self.language_info))
+
+    def parse_source(self, src_file: Path, digest: str = None) -> SourceFile | None:
+        """One source language file; None if it cannot be read or a .txt file holds no entries."""
+        name    = src_file.relative_to(self._get_translation_path(self.source_lang)).as_posix()
+        is_json = src_file.suffix.lower() == ".json"
+        dest    = self._dest_path(src_file)
+        try:
+            if self.manifest and digest is None:
+                digest = self.manifest.source_hash(src_file, name)
+            data = src_file.read_bytes()
+            self.metrics.count("io.bytes_read", len(data))
+            with self.metrics.timer("time.parse_s"):
+                if is_json:
+                    entries = json.loads(data.decode("utf-8-sig"))
+                else:
+                    entries = strip_key_prefixes(parse_txt(data.decode("utf-8-sig"), src_file), dest.stem)
+        except Exception as e:
+            print(f"    [!] Could not read {src_file.name}: {e}")
+            return None
+        if not (entries or is_json):
+            return None
+        return SourceFile(src_file, name, dest, MappingProxyType(entries), digest)
+
+    def collect_pending(self) -> dict:
+        """
+        Source values still missing from each target language, without translating anything.
+        {lang: [text, ...]} — one entry per occurrence, duplicates included.
+        """
+        source_path = self._get_translation_path(self.source_lang)
+        if not source_path.is_dir() or not self.languages:
             return {}
 
-        self.api_call_count += 1
-        result       = {}
-        to_translate = []
+        pending = {}
+        sources = self._load_sources()
+        for lang in self.languages:
+            lang_path = self._get_translation_path(lang)
+            texts     = []
+            for src in sources:
+                if not self.in_shard(src.name, lang):
+                    continue
+                if self.journal and self.journal.is_done(self.root, src.name, lang):
+                    continue
+                existing = self._load_existing(lang_path / src.dest)
+                texts   += self._pending_values(src.entries, self._preserved_keys(src, lang, existing))
+            if texts:
+                pending[lang] = texts
+        return pending
+
+    async def _translate_salvaging(self, source_code: str, target_code: str, batch: list,
+                                   lang: str, keep, attempt: int = 0):
+        """
+        Sends one batch through the scheduler. On failure the batch is split in half and both halves are
+        retried concurrently after a jittered backoff, so strings that do succeed are kept (and cached) straight away.
+        Strings whose translation lost a placeholder are sent again on their own.
+        """
+        if self.scheduler.cancelled.is_set():
+            return
+        try:
+            translations = await self.scheduler.translate(self.backend, source_code, target_code, batch)
+            if not translations or len(translations) != len(batch):
+                raise ValueError(f"Empty response from {self.backend.name} backend.")
+        except Cancelled:
+            return
+        except Exception as e:
+            self._count_call(batch)
+            if not self.scheduler.retry.should_retry(e, attempt):
+                print(f"    [!] {lang} — translation error ({len(batch)} string(s) given up): {e}")
+                self._emit("failed", lang=lang, strings=len(batch))
+                return
+            await self.scheduler.backoff(e, attempt)
+            halves = [batch] if len(batch) == 1 else [batch[:len(batch) // 2], batch[len(batch) // 2:]]
+            await asyncio.gather(*(
+                self._translate_salvaging(source_code, target_code, half, lang, keep, attempt + 1)
+                for half in halves
+            ))
+            return
 
-        for text in texts:
-            cached = self.translation_cache.get((lang, text))
+        self._count_call(batch)
+        # deep_translator returns None for some inputs (e.g. "..."); such items count as lost, not as a failed batch
+        received = {key: raw for key, raw in zip(batch, translations) if isinstance(raw, str)}
+        lost     = [key for key in batch if key not in received] + await keep(received)
+        self._emit("batch", lang=lang, strings=len(batch) - len(lost), chars=sum(len(t) for t in batch))
+        if not lost:
+            return
+        if attempt >= self.scheduler.retry.attempts:
+            print(f"    [!] {lang} — {len(lost)} translation(s) kept coming back empty or without their placeholders, given up")
+            self._emit("failed", lang=lang, strings=len(lost))
+            return
+        await asyncio.gather(*(
+            self._translate_salvaging(source_code, target_code, [key], lang, keep, attempt + 1)
+            for key in lost
+        ))
+
+    def _count_call(self, batch: list):
+        with self._counts_lock:
+            self.api_call_count += self.backend.request_cost(batch)
+
+    def lookup_known(self, texts: list, lang: str) -> dict:
+        """
+        Translations already available without a backend call, from the in-process cache or the
+        translation memory. Memory hits are promoted into the cache.
+        The memory stores translations in their protected form, so one entry serves every string
+        that differs only in its placeholders. With a TemplateIndex, strings that differ from a known
+        one only in their numbers are served too.
+        """
+        result      = {}
+        missing     = []
+        unique      = dict.fromkeys(texts)
+        source_code = self._get_tr_code(self.source_lang)
+        target_code = self._get_tr_code(lang)
+        for text in unique:
+            cached = self.translation_cache.get((target_code, text))
             if cached is not None:
                 result[text] = cached
             else:
-                to_translate.append(text)
+                missing.append(text)
 
-        if to_translate:
+        memory_hits = 0
+        protected   = {text: protect(text) for text in missing} if self.memory or self.templates else {}
+        if missing and self.memory:
             try:
-                translator = GoogleTranslator(
-                    source=self._get_tr_code(self.source_lang),
-                    target=self._get_tr_code(lang)
-                )
-                translations = translator.translate_batch([self._modulate(t) for t in to_translate])
-
-                if not translations:
-                    raise ValueError("Empty response from Google Translate.")
-
-                for original, raw in zip(to_translate, translations):
-                    final = self._demodulate(raw)
-                    self.translation_cache[(lang, original)] = final
-                    result[original] = final
+                stored = self.memory.get_many(source_code, target_code, [key for key, _ in protected.values()])
             except Exception as e:
-                print(f"    [!] {lang} — translation error: {e}")
-                return None
+                print(f"    [!] {lang} — translation memory unavailable: {e}")
+                stored = {}
+            for original, (key, spans) in protected.items():
+                raw   = stored.get(key)
+                final = restore(raw, spans) if raw is not None else None
+                if final is not None:
+                    self.translation_cache[(target_code, original)] = final
+                    result[original] = final
+                    memory_hits += 1
+            with self._counts_lock:
+                self.memory_hits += memory_hits
+
+        still = [text for text in missing if text not in result]
+        if still and self.templates:
+            reused = []
+            for original in still:
+                key, spans = protected[original]
+                raw        = self.templates.find(source_code, target_code, key)
+                final      = restore(raw, spans) if raw is not None else None
+                if final is not None:
+                    self.translation_cache[(target_code, original)] = final
+                    result[original] = final
+                    reused.append(original)
+            if reused:
+                keys = lambda texts: list(dict.fromkeys(protected[text][0] for text in texts))
+                self.metrics.count("fuzzy.strings", len(reused))
+                self.metrics.count("fuzzy.chars_saved", sum(map(len, keys(reused))))
+                self.metrics.count(
+                    "fuzzy.requests_saved",
+                    self._request_cost(keys(still)) - self._request_cost(keys(t for t in still if t not in result))
+                )
 
+        self.metrics.count("cache.hits", len(unique) - len(missing))
+        self.metrics.count("memory.hits", memory_hits)
+        self.metrics.count("cache.misses", len(unique) - len(result))
         return result
 
-    def _translate_json_files(self, source_path: Path, json_files: list):
-        print(f"\n[B42]  {self.root.name}  ({len(json_files)} file(s))")
-        total_start = time.perf_counter()
+    def _request_cost(self, keys: list) -> int:
+        return sum(map(self.backend.request_cost, self.scheduler.packer(self.backend).batches(keys)))
 
-        def process_language(lang: str):
-            lang_start    = time.perf_counter()
-            lang_path     = self._get_translation_path(lang)
-            lang_path.mkdir(exist_ok=True)
-            total_written = 0
-            total_skipped = 0
+    def _batch_translate(self, texts: list, lang: str) -> dict:
+        """Synchronous wrapper around translate_async for callers outside the event loop."""
+        if not texts:
+            return {}
+        return self.scheduler.run(self.translate_async(texts, lang))
+
+    async def translate_async(self, texts: list, lang: str) -> dict:
+        """
+        Returns {original: translation} for every string that could be translated.
+        Strings missing from the result failed even after retries, or were held back
+        because backend calls are disabled (budgeted runs).
+        """
+        if not texts:
+            return {}
 
-            for src_file in json_files:
-                dest_file = lang_path / src_file.relative_to(source_path)
-                dest_file.parent.mkdir(parents=True, exist_ok=True)
+        result       = await self.scheduler.offload(self.lookup_known, texts, lang)
+        to_translate = [text for text in dict.fromkeys(texts) if text not in result]
+        if not self.allow_backend:
+            return result
 
-                try:
-                    with open(src_file, "r", encoding="utf-8-sig") as f:
-                        src_data: dict = json.load(f)
-                except Exception as e:
-                    print(f"    [!] Could not read {src_file.name}: {e}")
-                    continue
+        source_code = self._get_tr_code(self.source_lang)
+        target_code = self._get_tr_code(lang)
 
-                existing = {}
-                if self.skip_existing and dest_file.exists():
+        if to_translate:
+            by_key = {}
+            for text in to_translate:
+                key, spans = protect(text)
+                by_key.setdefault(key, []).append((text, spans))
+
+            # keys that only differ in their numbers are sent once; the others are derived from that translation
+            siblings = {}
+            if self.templates:
+                shapes = {}
+                for key in by_key:
+                    shape, numbers = template(key)
+                    if numbers:
+                        first = shapes.setdefault(shape, key)
+                        if first != key:
+                            siblings.setdefault(first, []).append(key)
+            derived = {key for keys in siblings.values() for key in keys}
+            send    = [key for key in by_key if key not in derived]
+            if derived:
+                self.metrics.count("fuzzy.chars_saved", sum(map(len, derived)))
+                self.metrics.count("fuzzy.requests_saved", self._request_cost(list(by_key)) - self._request_cost(send))
+
+            def apply(key: str, raw: str, finals: dict) -> bool:
+                restored = [(original, restore(raw, spans)) for original, spans in by_key[key]]
+                if any(final is None for _, final in restored):
+                    return False
+                for original, final in restored:
+                    self.translation_cache[(target_code, original)] = final
+                    result[original] = final
+                    finals[original] = final
+                return True
+
+            def store(fresh: dict, finals: dict):
+                if self.journal:
+                    self.journal.batch_done(target_code, finals)
+                if self.templates:
+                    self.templates.add(source_code, target_code, fresh)
+                if self.memory:
                     try:
-                        with open(dest_file, "r", encoding="utf-8-sig") as f:
-                            existing = json.load(f)
-                    except Exception:
-                        pass
-
-                to_translate = [
-                    value for key, value in src_data.items()
-                    if isinstance(value, str) and value.strip()
-                    and not (self.skip_existing and key in existing)
-                ]
-                skipped = sum(1 for key in src_data if self.skip_existing and key in existing)
-
-                translated_values = self._batch_translate(to_translate, lang)
-                if translated_values is None:
-                    print(f"    [!] {src_file.name} — skipped for {lang} (translation error)")
-                    continue
+                        self.memory.put_many(source_code, target_code, fresh)
+                    except Exception as e:
+                        print(f"    [!] {lang} — could not update translation memory: {e}")
+
+            async def keep(translations: dict) -> list:
+                fresh  = {}
+                finals = {}
+                lost   = []
+                for key, raw in translations.items():
+                    if not apply(key, raw, finals):
+                        lost.append(key)
+                        continue
+                    fresh[key] = raw
+                    for sibling in siblings.pop(key, ()):
+                        sibling_raw = TemplateIndex.derive(key, raw, sibling)
+                        if sibling_raw is not None and apply(sibling, sibling_raw, finals):
+                            self.metrics.count("fuzzy.strings", len(by_key[sibling]))
+                        else:
+                            self.metrics.count("fuzzy.fallbacks")
+                            lost.append(sibling)
+                if fresh:
+                    await self.scheduler.offload(store, fresh, finals)
+                return lost
+
+            batches = self.scheduler.packer(self.backend).batches(send)
+
+            async def drain():
+                for batch in batches:
+                    if self.scheduler.cancelled.is_set():
+                        break
+                    await self._translate_salvaging(source_code, target_code, batch, lang, keep)
+
+            await asyncio.gather(*(drain() for _ in range(self.scheduler.max_workers)))
 
-                output = {}
-                for key, value in src_data.items():
-                    if self.skip_existing and key in existing:
-                        output[key] = existing[key]
-                    elif isinstance(value, str):
-                        output[key] = translated_values.get(value, value)
-                    else:
-                        output[key] = value
-
-                dest_file.write_text(
-                    json.dumps(output, indent=4, ensure_ascii=False),
-                    encoding="utf-8"
-                )
-                total_written += len(to_translate)
-                total_skipped += skipped
-
-            elapsed   = (time.perf_counter() - lang_start) * 1000
-            lang_name = self.language_info.get(lang, {}).get("text", "")
-            skip_note = f"  ({total_skipped} existing preserved)" if total_skipped else ""
-            print(f"  {lang:<6}  {lang_name:<24}  {total_written} translated{skip_note}   {elapsed:.0f}ms")
-
-        with ThreadPoolExecutor() as executor:
-            for future in as_completed([executor.submit(process_language, lang) for lang in self.languages]):
-                future.result()
-
-        elapsed = (time.perf_counter() - total_start) * 1000
-        print(f"  Done — {len(self.languages)} language(s) in {elapsed/1000:.1f}s  |  {self.api_call_count} API call(s)")
+        return result
 
-    def _translate_txt_to_json(self, source_path: Path, txt_files: list):
-        print(f"\n[B42]  {self.root.name}  ({len(txt_files)} file(s), converting txt → json)")
+    def _translate_sources(self, sources: tuple) -> list:
+        converting = any(src.path.suffix.lower() == ".txt" for src in sources)
+        unchanged  = f", {self.unchanged_files} unchanged" if self.unchanged_files else ""
+        print(f"\n[B42]  {self.root.name}  ({len(sources)} file(s){unchanged}{', converting txt → json' if converting else ''})")
         total_start = time.perf_counter()
-
-        parsed_files: dict[Path, dict] = {}
-        for txt_path in txt_files:
-            try:
-                entries = parse_txt(txt_path.read_text(encoding="utf-8-sig"), txt_path)
-                if entries:
-                    parsed_files[txt_path] = entries
-            except Exception as e:
-                print(f"    [!] Could not read {txt_path.name}: {e}")
+        dest_dirs   = sorted({src.dest.parent for src in sources})
 
         def process_language(lang: str):
             lang_start    = time.perf_counter()
             lang_path     = self._get_translation_path(lang)
-            lang_path.mkdir(exist_ok=True)
             total_written = 0
             total_skipped = 0
-
-            for txt_path, entries in parsed_files.items():
-                dest_file = lang_path / json_output_name(txt_path.stem, self.language_info)
-                entries   = strip_key_prefixes(entries, dest_file.stem)
-
-                existing = {}
-                if self.skip_existing and dest_file.exists():
-                    try:
-                        with open(dest_file, "r", encoding="utf-8-sig") as f:
-                            existing = json.load(f)
-                    except Exception:
-                        pass
-
-                to_translate = [
-                    value for key, value in entries.items()
-                    if isinstance(value, str) and value.strip()
-                    and not (self.skip_existing and key in existing)
-                ]
-                skipped = sum(1 for key in entries if self.skip_existing and key in existing)
-
-                translated_values = self._batch_translate(to_translate, lang)
-                if translated_values is None:
-                    print(f"    [!] {txt_path.name} — skipped for {lang} (translation error)")
+            unchanged     = 0
+            resumed       = 0
+            elsewhere     = 0
+
+            for dest_dir in dest_dirs:
+                (lang_path / dest_dir).mkdir(parents=True, exist_ok=True)
+
+            for src in sources:
+                if self.scheduler.cancelled.is_set():
+                    return
+                if not self.in_shard(src.name, lang):
+                    elsewhere += 1
                     continue
-
-                output = {}
-                for key, value in entries.items():
-                    if self.skip_existing and key in existing:
-                        output[key] = existing[key]
-                    else:
-                        output[key] = translated_values.get(value, value)
-
-                dest_file.write_text(
-                    json.dumps(output, indent=4, ensure_ascii=False),
-                    encoding="utf-8"
-                )
-                total_written += len(to_translate)
+                if self.journal and self.journal.is_done(self.root, src.name, lang):
+                    resumed += 1
+                    continue
+                done = self._translate_unit(src, lang)
+                if done is None:
+                    continue
+                written_count, skipped, replaced = done
+                unchanged     += not replaced
+                total_written += written_count
                 total_skipped += skipped
 
             elapsed   = (time.perf_counter() - lang_start) * 1000
             lang_name = self.language_info.get(lang, {}).get("text", "")
             skip_note = f"  ({total_skipped} existing preserved)" if total_skipped else ""
+            skip_note += f"  ({resumed} file(s) done before resume)" if resumed else ""
+            skip_note += f"  ({unchanged} file(s) already up to date)" if unchanged else ""
+            skip_note += f"  ({elsewhere} file(s) in other shards)" if elsewhere else ""
             print(f"  {lang:<6}  {lang_name:<24}  {total_written} translated{skip_note}   {elapsed:.0f}ms")
 
-        with ThreadPoolExecutor() as executor:
-            for future in as_completed([executor.submit(process_language, lang) for lang in self.languages]):
-                future.result()
-
-        elapsed = (time.perf_counter() - total_start) * 1000
-        print(f"  Done — {len(self.languages)} language(s) in {elapsed/1000:.1f}s  |  {self.api_call_count} API call(s)")
+        return self._submit_languages(process_language, total_start)
+
+    def _translate_unit(self, src: SourceFile, lang: str, changed: set = None) -> tuple | None:
+        """
+        Translates one source file into one language and writes it.
+        Returns (strings translated, keys preserved, file replaced), or None when nothing could be translated.
+        With `changed`, only those keys are translated again; every other key the target already has keeps
+        its translation, whatever skip_existing says. A string that fails keeps its previous translation.
+        """
+        dest_file = self._get_translation_path(lang) / src.dest
+        with self.metrics.timer("time.diff_s"):
+            existing = self._load_existing(dest_file, always=True)
+            if changed is None:
+                preserved = self._preserved_keys(src, lang, existing)
+            else:
+                preserved = {key for key in src.entries if key in existing and key not in changed}
+            to_translate = self._pending_values(src.entries, preserved)
+
+        translated_values = self._batch_translate(to_translate, lang)
+        failed = {value for value in to_translate if value not in translated_values}
+        if failed:
+            print(f"    [!] {src.path.name} — {len(failed)} string(s) not translated for {lang}, left for the next run")
+            if len(failed) == len(set(to_translate)):
+                return None
 
-    def translate_files(self):
+        written     = []
+        failed_keys = {
+            key for key, value in src.entries.items()
+            if key not in preserved and isinstance(value, str) and value in failed
+        }
+
+        def output():
+            for key, value in src.entries.items():
+                if key in preserved:
+                    value = existing[key]
+                elif key in failed_keys:
+                    if key not in existing:
+                        continue
+                    value = existing[key]
+                elif isinstance(value, str):
+                    value = translated_values.get(value, value)
+                written.append(key)
+                yield key, value
+
+        with self.metrics.timer("time.write_s"):
+            replaced = write_json(dest_file, output())
+        if replaced:
+            self.metrics.count("io.bytes_written", dest_file.stat().st_size)
+            self.metrics.count("files.written")
+        else:
+            self.metrics.count("files.unchanged")
+        if self.manifest:
+            self.manifest.record(src.name, lang, src.digest, dest_file, src.entries, written, failed_keys)
+        if self.journal and not failed:
+            self.journal.unit_done(self.root, src.name, lang)  # units with failed strings are retried on -resume
+        written_count = len(to_translate) - sum(1 for value in to_translate if value in failed)
+        self._emit("file", lang=lang, directory=self.root, file=src.name, strings=written_count)
+        return written_count, len(preserved), replaced
+
+    def update_sources(self, changes: list) -> dict:
+        """
+        Writes edited source files ([(SourceFile, keys added or modified)]) to every language, translating
+        only those keys. Languages sharing a backend code wait for the first one and reuse its translations.
+        Returns {lang: strings translated}.
+        """
+        leaders = {}
+        for lang in self.languages:
+            leaders.setdefault(self._get_tr_code(lang), lang)
+        followers = [lang for lang in self.languages if lang not in leaders.values()]
+        dest_dirs = sorted({src.dest.parent for src, _ in changes})
+        counts    = {}
+
+        def update_language(lang: str):
+            counts[lang] = 0
+            for dest_dir in dest_dirs:
+                (self._get_translation_path(lang) / dest_dir).mkdir(parents=True, exist_ok=True)
+            for src, keys in changes:
+                if self.scheduler.cancelled.is_set():
+                    return
+                done = self._translate_unit(src, lang, changed=keys)
+                if done is not None:
+                    counts[lang] += done[0]
+
+        for group in (list(leaders.values()), followers):
+            for future in [self.scheduler.submit(update_language, lang) for lang in group]:
+                try:
+                    future.result()
+                except CancelledError:
+                    pass
+        if self.manifest:
+            self.manifest.save()
+        return counts
+
+    def _submit_languages(self, process_language, total_start: float) -> list:
+        """The language futures, plus one resolved once the manifest is saved and the directory reported."""
+        futures   = [self.scheduler.submit(process_language, lang) for lang in self.languages]
+        finished  = Future()
+        remaining = [len(futures)]
+        lock      = threading.Lock()
+
+        def on_done(_):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            try:
+                if self.manifest:
+                    self.manifest.save()
+                if self.scheduler.cancelled.is_set():
+                    return
+                elapsed = (time.perf_counter() - total_start) * 1000
+                print(f"  Done — {len(self.languages)} language(s) in {elapsed/1000:.1f}s")
+            finally:
+                finished.set_result(None)
+
+        for future in futures:
+            future.add_done_callback(on_done)
+        return futures + [finished]
+
+    def translate_files(self, wait_done: bool = True) -> list:
+        """
+        Submits one work unit per target language to the shared scheduler.
+        With wait_done=False the futures are returned so callers can wait on many directories at once.
+        """
         source_path = self._get_translation_path(self.source_lang)
         if not source_path.is_dir() or not self.languages:
-            return
+            return []
 
-        json_files = list(source_path.rglob("*.json"))
-        txt_files  = list(source_path.rglob("*.txt"))
+        sources = self._load_sources()
+        if not sources:
+            if self.unchanged_files:
+                self.manifest.save()
+                print(f"\n[B42]  {self.root.name}  ({self.unchanged_files} file(s) unchanged — skipped)")
+            else:
+                print(f"  [!] No translation files found in {source_path}")
+            return []
 
-        if json_files:
-            self._translate_json_files(source_path, json_files)
-        elif txt_files:
-            self._translate_txt_to_json(source_path, txt_files)
-        else:
-            print(f"  [!] No translation files found in {source_path}")
+        futures = self._translate_sources(sources)
+
+        if wait_done:
+            for future in futures:
+                try:
+                    future.result()
+                except CancelledError:
+                    pass
+        return futures
+
+
+def translate_tree(base_dir: Path, languages: list, source_lang: str = "EN",
+                   skip_existing: bool = True, incremental: bool = False, backend: Backend = None,
+                   memory: TranslationMemory = None, scheduler: Scheduler = None,
+                   dry_run: bool = False, budget: int = None,
+                   checkpoint: BudgetCheckpoint = None, journal: JobJournal = None,
+                   progress=None, scan_index: Path = None, fuzzy: bool = False,
+                   tr_codes: dict = None, cache: dict = None, shard: Shard = None) -> TranslationPlan:
+    """
+    Translates every B42 Translate directory below base_dir with one shared cache, cross-mod plan and scheduler.
+    scheduler.cancel() from any thread stops the run; the options are described in the README.
+    """
+    backend     = backend or GoogleBackend()
+    own_pool    = scheduler is None
+    scheduler   = scheduler or Scheduler(retry=RetryPolicy(fatal=backend.fatal_errors))
+    cache       = {} if cache is None else cache
+    index       = None
+    templates   = TemplateIndex(memory) if fuzzy else None
+    if journal and journal.dirs is not None:
+        # resumed: no tree walk, each Translator lists only its own directory
+        dirs = journal.dirs
+        cache.update(journal.batches)
+    else:
+        index = scanner.scan(base_dir, scan_index)
+        dirs  = index.translate_dirs()
+        if journal:
+            journal.record_dirs(dirs)
+
+    translators = [
+        Translator(
+            d, languages,
+            source_lang=source_lang,
+            skip_existing=skip_existing,
+            memory=memory,
+            cache=cache,
+            scheduler=scheduler,
+            incremental=incremental,
+            backend=backend,
+            journal=journal,
+            progress=progress,
+            index=index,
+            templates=templates,
+            tr_codes=tr_codes,
+            shard=shard
+        )
+        for d in dirs
+    ]
+
+    plan = TranslationPlan(translators).build()
+    plan.resolve_known()
+    if budget is not None:
+        plan.apply_budget(budget, checkpoint)
+    plan.report()
+    if progress:
+        progress(Event(
+            "plan",
+            strings=plan.unique_count,
+            chars=sum(plan._chars(text) for texts in plan.unique.values() for text in texts),
+            total=sum(
+                1 for t in translators for src in t._load_sources() for lang in t.languages
+                if t.in_shard(src.name, lang) and not (journal and journal.is_done(t.root, src.name, lang))
+            )
+        ))
+
+    if dry_run:
+        plan.report_costs()
+    else:
+        sent_before = scheduler.characters
+        plan.execute()
+
+        if budget is not None and not scheduler.cancelled.is_set():
+            for translator in translators:
+                translator.allow_backend = False
+            if checkpoint:
+                checkpoint.save(scheduler.characters - sent_before, plan.remaining_items())
+
+        if not scheduler.cancelled.is_set():
+            futures = [f for t in translators for f in t.translate_files(wait_done=False)]
+            for future in futures:
+                try:
+                    future.result()
+                except CancelledError:
+                    pass
+            plan.report_usage()
+
+    if own_pool:
+        scheduler.shutdown()
+    if progress:
+        progress(Event("done"))
+    return plan
+
+
+def watch_tree(base_dir: Path, languages: list, source_lang: str = "EN", incremental: bool = False,
+               backend: Backend = None, memory: TranslationMemory = None, scheduler: Scheduler = None,
+               scan_index: Path = None, fuzzy: bool = False, tr_codes: dict = None, cache: dict = None,
+               interval: float = watcher.DEFAULT_INTERVAL, debounce: float = watcher.DEFAULT_DEBOUNCE,
+               stop: threading.Event = None):
+    """Keeps every language in step with the source language below base_dir until stop is set (see watcher.py)."""
+    backend   = backend or GoogleBackend()
+    own_pool  = scheduler is None
+    scheduler = scheduler or Scheduler(retry=RetryPolicy(fatal=backend.fatal_errors))
+    index     = scanner.scan(base_dir, scan_index)
+    templates = TemplateIndex(memory) if fuzzy else None
+
+    translators = [
+        Translator(
+            d, languages,
+            source_lang=source_lang,
+            memory=memory,
+            cache=cache,
+            scheduler=scheduler,
+            incremental=incremental,
+            backend=backend,
+            index=index,
+            templates=templates,
+            tr_codes=tr_codes
+        )
+        for d in index.translate_dirs()
+    ]
+    try:
+        watcher.watch([t for t in translators if t.languages], interval, debounce, stop)
+    finally:
+        if own_pool:
+            scheduler.shutdown()
 
 
 if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+    if sys.argv[1:2] == ["serve"]:
+        import server
+        server.main(sys.argv[2:])
+        sys.exit(0)
+
     parser = argparse.ArgumentParser(description="PZ Translation Tool")
     parser.add_argument("directory")
     parser.add_argument("-source",    default="EN")
     parser.add_argument("-overwrite", action="store_true")
     parser.add_argument("-languages", nargs="*", default=[])
+    parser.add_argument("-backend",   default="google")
+    parser.add_argument("-memory",    default=None)
+    parser.add_argument("-no-memory", action="store_true")
+    parser.add_argument("-max-workers", type=int, default=DEFAULT_MAX_WORKERS)
+    parser.add_argument("-rps",         type=float, default=None)
+    parser.add_argument("-cps",         type=float, default=None)
+    parser.add_argument("-retries",     type=int, default=DEFAULT_RETRIES)
+    parser.add_argument("-batch-chars", type=int, default=None)
+    parser.add_argument("-batch-items", type=int, default=None)
+    parser.add_argument("-incremental", action="store_true")
+    parser.add_argument("-dry-run", "-plan", action="store_true", dest="dry_run")
+    parser.add_argument("-budget",      type=int, default=None)
+    parser.add_argument("-checkpoint",  default=None)
+    parser.add_argument("-resume",      action="store_true")
+    parser.add_argument("-metrics-out", default=None)
+    parser.add_argument("-trace",       action="store_true")
+    parser.add_argument("-scan-index",  default=None)
+    parser.add_argument("-fuzzy",       action="store_true")
+    parser.add_argument("-tr-code",     nargs="*", default=[], metavar="LANG=CODE")
+    parser.add_argument("-server",      nargs="?", default=None, const="127.0.0.1:8765", metavar="HOST:PORT")
+    parser.add_argument("-watch",       action="store_true")
+    parser.add_argument("-debounce",    type=float, default=watcher.DEFAULT_DEBOUNCE)
+    parser.add_argument("-shard",       default=None, metavar="i/N")
 
     args     = parser.parse_args()
     base_dir = Path(args.directory).resolve()
@@ -327,23 +825,161 @@ if __name__ == "__main__":
         print(f"Invalid directory: {base_dir}")
         sys.exit(1)
 
+    try:
+        shard = Shard.parse(args.shard, base_dir) if args.shard else None
+    except ValueError as e:
+        print(f"Invalid -shard value — {e}")
+        sys.exit(1)
+
+    journal      = None
+    journal_path = base_dir / JobJournal.FILE_NAME
+    if shard:
+        # shards sharing a checkout keep separate journals
+        journal_path = journal_path.with_name(f".pz-translator-job.{shard.index}-of-{shard.count}.jsonl")
+    if args.resume:
+        if journal_path.exists():
+            journal = JobJournal.resume(journal_path)
+            for name, value in journal.settings.items():
+                setattr(args, name, value)
+            print(f"Resuming job — {len(journal.completed)} unit(s) and {len(journal.batches)} translation(s) already done")
+        else:
+            print(f"[!] No job to resume in {base_dir} — starting a new one")
+    elif journal_path.exists():
+        print(f"[!] Discarding an unfinished job in {base_dir} (use -resume to continue it)")
+
+    try:
+        tr_codes = dict(item.split("=", 1) for item in args.tr_code)
+    except ValueError:
+        print(f"Invalid -tr-code value — expected LANG=CODE, got: {' '.join(args.tr_code)}")
+        sys.exit(1)
+
+    if args.server:
+        import server
+        try:
+            sys.exit(server.run_client(args.server, {
+                "directory":   str(base_dir),
+                "languages":   args.languages,
+                "source":      args.source,
+                "overwrite":   args.overwrite,
+                "incremental": args.incremental,
+                "fuzzy":       args.fuzzy,
+                "tr_code":     tr_codes,
+                "dry_run":     args.dry_run,
+                "shard":       args.shard,
+            }))
+        except (OSError, ValueError) as e:
+            print(f"[!] Translation server at {args.server} failed: {e}")
+            sys.exit(1)
+
     langs_display = ', '.join(args.languages) if args.languages else "all"
-    print(f"Source: {args.source}  |  Languages: {langs_display}  |  Overwrite: {args.overwrite}")
+    shard_display = f"  |  Shard: {shard}" if shard else ""
+    print(f"Source: {args.source}  |  Languages: {langs_display}  |  Overwrite: {args.overwrite}  |  Backend: {args.backend}{shard_display}")
 
+    try:
+        backend = create_backend(args.backend)
+    except (ValueError, TypeError, ImportError) as e:
+        print(f"Invalid backend '{args.backend}': {e}")
+        sys.exit(1)
+
+    unsupported = [f"{lang}={code}" for lang, code in tr_codes.items() if not backend.supports(code)]
+    if unsupported:
+        print(f"Invalid -tr-code value — not a {backend.name} language code: {' '.join(unsupported)}")
+        sys.exit(1)
+
+    memory_path = Path(args.memory) if args.memory else default_memory_path(backend.name)
+    memory      = None if args.no_memory else TranslationMemory(memory_path)
+
+    scheduler   = Scheduler(
+        args.max_workers, rps=args.rps, cps=args.cps,
+        retry=RetryPolicy(args.retries, fatal=backend.fatal_errors),
+        batch_chars=args.batch_chars, batch_items=args.batch_items,
+        metrics=Metrics(trace=args.trace)
+    )
+    checkpoint = None
+    if args.budget is not None:
+        checkpoint_path = Path(args.checkpoint) if args.checkpoint else base_dir / ".pz-translator-budget.json"
+        if shard and not args.checkpoint:
+            # like the journal, each shard keeps its own budget checkpoint
+            checkpoint_path = checkpoint_path.with_name(f".pz-translator-budget.{shard.index}-of-{shard.count}.json")
+        checkpoint = BudgetCheckpoint(checkpoint_path)
+
+    if journal is None and not args.dry_run:
+        journal = JobJournal.start(journal_path, {
+            "source":      args.source,
+            "overwrite":   args.overwrite,
+            "languages":   args.languages,
+            "incremental": args.incremental,
+            "tr_code":     args.tr_code,
+        })
+
+    cache       = {}
     total_start = time.perf_counter()
-    with ThreadPoolExecutor() as executor:
-        futures = [
-            executor.submit(
-                Translator(
-                    d, args.languages,
-                    source_lang=args.source,
-                    skip_existing=not args.overwrite
-                ).translate_files
+    try:
+        translate_tree(
+            base_dir, args.languages,
+            source_lang=args.source,
+            skip_existing=not args.overwrite,
+            incremental=args.incremental,
+            backend=backend,
+            memory=memory,
+            scheduler=scheduler,
+            dry_run=args.dry_run,
+            budget=args.budget,
+            checkpoint=checkpoint,
+            journal=journal,
+            scan_index=Path(args.scan_index) if args.scan_index else None,
+            fuzzy=args.fuzzy,
+            tr_codes=tr_codes,
+            cache=cache,
+            shard=shard
+        )
+    except KeyboardInterrupt:
+        scheduler.cancel()
+        if journal:
+            journal.close()
+        if args.metrics_out:
+            scheduler.metrics.dump(Path(args.metrics_out), backend=backend.name, languages=args.languages, interrupted=True)
+        print("\nInterrupted — finished work is saved, continue with -resume")
+        sys.exit(130)
+    if journal:
+        journal.finish()
+
+    if args.watch and shard:
+        print("[!] -watch is not available with -shard — run it without sharding")
+    elif args.watch and not args.dry_run and not scheduler.cancelled.is_set():
+        try:
+            watch_tree(
+                base_dir, args.languages,
+                source_lang=args.source,
+                incremental=args.incremental,
+                backend=backend,
+                memory=memory,
+                scheduler=scheduler,
+                scan_index=Path(args.scan_index) if args.scan_index else None,
+                fuzzy=args.fuzzy,
+                tr_codes=tr_codes,
+                cache=cache,
+                debounce=args.debounce
             )
-            for d in base_dir.rglob("Translate")
-            if d.is_dir() and not Translator.is_b41_folder(d)
-        ]
-        for future in as_completed(futures):
-            future.result()
-
-    print(f"\nFinished in {(time.perf_counter() - total_start):.1f}s")
+        except KeyboardInterrupt:
+            scheduler.cancel()
+            print("\nStopped watching")
+    scheduler.shutdown()
+    backend.close()
+
+    if memory:
+        memory.close()
+
+    throttle_note = f"  |  {scheduler.throttled:.1f}s throttled" if scheduler.throttled else ""
+    retry_note    = f"  |  {scheduler.retries} retr{'y' if scheduler.retries == 1 else 'ies'}" if scheduler.retries else ""
+    print(f"\nFinished in {(time.perf_counter() - total_start):.1f}s  |  {scheduler.calls} backend request(s){retry_note}{throttle_note}")
+    counters = scheduler.metrics.counters
+    if counters.get("fuzzy.strings"):
+        print(
+            f"Templates — {counters['fuzzy.strings']} string(s) reused  |  {counters.get('fuzzy.chars_saved', 0)} character(s)"
+            f"  |  ~{counters.get('fuzzy.requests_saved', 0)} backend request(s) saved"
+        )
+
+    if args.metrics_out:
+        scheduler.metrics.dump(Path(args.metrics_out), backend=backend.name, languages=args.languages)
+        print(f"Metrics written to {args.metrics_out}")
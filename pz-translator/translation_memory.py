@@ -0,0 +1,252 @@
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from pathlib import Path
+
+DEFAULT_MEMORY_PATH = Path.home() / ".pz-translator" / "translation_memory.db"
+
+
+def default_memory_path(backend: str = "google") -> Path:
+    """Non-Google backends get their own database so mock output never mixes with real translations."""
+    if backend == "google":
+        return DEFAULT_MEMORY_PATH
+    return DEFAULT_MEMORY_PATH.with_name(f"translation_memory.{backend}.db")
+
+
+class TranslationMemory:
+    """
+    Persistent translation memory shared across runs, Translate directories and processes.
+    Keyed by (source tr_code, target tr_code, modulated source text).
+    """
+    SQL_BATCH = 500
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS memory (
+            source_code TEXT NOT NULL,
+            target_code TEXT NOT NULL,
+            source_text TEXT NOT NULL,
+            translation TEXT NOT NULL,
+            created     REAL NOT NULL,
+            last_used   REAL NOT NULL,
+            PRIMARY KEY (source_code, target_code, source_text)
+        ) WITHOUT ROWID
+    """
+
+    def __init__(self, path: Path = DEFAULT_MEMORY_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(self.SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write(self, sql: str, rows: list) -> int:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                changed = self._conn.executemany(sql, rows).rowcount
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return changed
+
+    def get_many(self, source_code: str, target_code: str, texts: list) -> dict:
+        found = {}
+        texts = list(dict.fromkeys(texts))
+        with self._lock:
+            for i in range(0, len(texts), self.SQL_BATCH):
+                chunk = texts[i:i + self.SQL_BATCH]
+                rows  = self._conn.execute(
+                    f"SELECT source_text, translation FROM memory "
+                    f"WHERE source_code = ? AND target_code = ? "
+                    f"AND source_text IN ({','.join('?' * len(chunk))})",
+                    [source_code, target_code, *chunk]
+                ).fetchall()
+                found.update(rows)
+
+        if found:
+            now = time.time()
+            self._write(
+                "UPDATE memory SET last_used = ? "
+                "WHERE source_code = ? AND target_code = ? AND source_text = ?",
+                [(now, source_code, target_code, text) for text in found]
+            )
+        return found
+
+    def numbered(self, source_code: str, target_code: str) -> list:
+        """(source text, translation) of every entry whose source text contains a digit."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT source_text, translation FROM memory "
+                "WHERE source_code = ? AND target_code = ? AND source_text GLOB '*[0-9]*'",
+                (source_code, target_code)
+            ).fetchall()
+
+    def put_many(self, source_code: str, target_code: str, translations: dict) -> int:
+        if not translations:
+            return 0
+        now = time.time()
+        return self._write(
+            "INSERT INTO memory VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (source_code, target_code, source_text) "
+            "DO UPDATE SET translation = excluded.translation, last_used = excluded.last_used",
+            [(source_code, target_code, text, tr, now, now) for text, tr in translations.items()]
+        )
+
+    def export_file(self, path: Path, target_codes: list = None) -> int:
+        count = 0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source_code, target_code, source_text, translation, created, last_used "
+                "FROM memory ORDER BY source_code, target_code, source_text"
+            ).fetchall()
+        with open(path, "w", encoding="utf-8") as f:
+            for source_code, target_code, text, tr, created, last_used in rows:
+                if target_codes and target_code not in target_codes:
+                    continue
+                f.write(json.dumps({
+                    "source":      source_code,
+                    "target":      target_code,
+                    "text":        text,
+                    "translation": tr,
+                    "created":     created,
+                    "last_used":   last_used,
+                }, ensure_ascii=False) + "\n")
+                count += 1
+        return count
+
+    def import_file(self, path: Path, replace: bool = False) -> int:
+        rows = []
+        now  = time.time()
+        with open(path, "r", encoding="utf-8-sig") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    rows.append((
+                        entry["source"], entry["target"], entry["text"], entry["translation"],
+                        entry.get("created", now), entry.get("last_used", now),
+                    ))
+                except (ValueError, KeyError) as e:
+                    print(f"    [!] {Path(path).name}:{number} — skipped ({e})")
+
+        conflict = "REPLACE" if replace else "IGNORE"
+        return self._write(f"INSERT OR {conflict} INTO memory VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def merge(self, path: Path) -> int:
+        """
+        Adds the entries of another memory database, e.g. one written by a shard on another host.
+        Where both hold a translation the most recently used one is kept.
+        """
+        if Path(path).resolve() == self.path.resolve():
+            return 0
+        with self._lock:
+            self._conn.execute("ATTACH DATABASE ? AS other", (str(path),))
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    changed = self._conn.execute(
+                        "INSERT INTO memory "
+                        "SELECT source_code, target_code, source_text, translation, created, last_used "
+                        "FROM other.memory WHERE true "
+                        "ON CONFLICT (source_code, target_code, source_text) DO UPDATE SET "
+                        "translation = CASE WHEN excluded.last_used > last_used "
+                        "THEN excluded.translation ELSE translation END, "
+                        "created = MIN(created, excluded.created), last_used = MAX(last_used, excluded.last_used)"
+                    ).rowcount
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            finally:
+                self._conn.execute("DETACH DATABASE other")
+        return changed
+
+    def prune(self, unused_days: float = None, target_codes: list = None) -> int:
+        clauses = []
+        params  = []
+        if unused_days is not None:
+            clauses.append("last_used < ?")
+            params.append(time.time() - unused_days * 86400)
+        if target_codes:
+            clauses.append(f"target_code IN ({','.join('?' * len(target_codes))})")
+            params.extend(target_codes)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        removed = self._write(f"DELETE FROM memory{where}", [params])
+        with self._lock:
+            self._conn.execute("VACUUM")
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT target_code, COUNT(*) FROM memory GROUP BY target_code ORDER BY target_code"
+            ).fetchall()
+        return dict(rows)
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+    parser = argparse.ArgumentParser(description="PZ Translation Memory")
+    parser.add_argument("-memory", default=str(DEFAULT_MEMORY_PATH))
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_cmd = commands.add_parser("export")
+    export_cmd.add_argument("file")
+    export_cmd.add_argument("-targets", nargs="*", default=[])
+
+    import_cmd = commands.add_parser("import")
+    import_cmd.add_argument("file")
+    import_cmd.add_argument("-replace", action="store_true")
+
+    merge_cmd = commands.add_parser("merge")
+    merge_cmd.add_argument("files", nargs="+")
+
+    prune_cmd = commands.add_parser("prune")
+    prune_cmd.add_argument("-unused-days", type=float, default=None)
+    prune_cmd.add_argument("-targets", nargs="*", default=[])
+
+    commands.add_parser("stats")
+
+    args = parser.parse_args()
+    with TranslationMemory(Path(args.memory)) as memory:
+        if args.command == "export":
+            print(f"Exported {memory.export_file(Path(args.file), args.targets)} entries → {args.file}")
+        elif args.command == "import":
+            print(f"Imported {memory.import_file(Path(args.file), args.replace)} entries ← {args.file}")
+        elif args.command == "merge":
+            for file in args.files:
+                if not Path(file).is_file():
+                    print(f"[!] {file} not found — skipped")
+                    continue
+                print(f"Merged {memory.merge(Path(file))} entries ← {file}")
+        elif args.command == "prune":
+            if args.unused_days is None and not args.targets:
+                print("[!] Refusing to prune everything — pass -unused-days and/or -targets")
+                sys.exit(1)
+            print(f"Pruned {memory.prune(args.unused_days, args.targets)} entries")
+        else:
+            stats = memory.stats()
+            for code, count in stats.items():
+                print(f"  {code:<6}  {count} entries")
+            print(f"Total: {sum(stats.values())} entries in {memory.path}")
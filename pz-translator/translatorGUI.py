@@ -1,94 +1,164 @@
-import re
 import sys
 import os
 import json
-import subprocess
+import threading
 from pathlib import Path
+from contextlib import redirect_stdout
 
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QFileDialog, QLabel, QCheckBox, QListWidget, QListWidgetItem,
     QTextEdit, QGroupBox, QComboBox, QSizePolicy, QProgressBar
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont, QTextCursor
 
+from translate import translate_tree
+from backends import GoogleBackend
+from scheduler import Scheduler, RetryPolicy
+from translation_memory import TranslationMemory, default_memory_path
+from journal import JobJournal
+from events import ProgressTracker
+from scanner import DEFAULT_INDEX_PATH
+from server import DEFAULT_ADDRESS, is_running, submit_job, cancel_job, job_records, to_event
+
 SETTINGS_FILE = "translator_settings.json"
 
-LANG_LINE_RE = re.compile(r'^\s{2}[A-Z]{2,6}\s')
 
+class LogWriter:
+    """File-like sink that forwards each complete line the engine prints to a Qt signal."""
+
+    def __init__(self, signal):
+        self.signal  = signal
+        self._buffer = ""
+        self._lock   = threading.Lock()
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            *lines, self._buffer = (self._buffer + text).split("\n")
+        for line in lines:
+            self.signal.emit(line)
+        return len(text)
 
-def count_translate_dirs(directory: str) -> int:
-    base = Path(directory).resolve()
-    count = 0
-    for d in base.rglob("Translate"):
-        if not d.is_dir():
-            continue
-        current = d
-        is_b41 = False
-        while current != current.parent:
-            if current.name.lower() == "mods":
-                is_b41 = len(d.relative_to(current).parts) == 5
-                break
-            current = current.parent
-        if not is_b41:
-            count += 1
-    return count
+    def flush(self):
+        pass
 
 
 class TranslationThread(QThread):
     output_signal   = pyqtSignal(str)
-    progress_signal = pyqtSignal(int)
+    event_signal    = pyqtSignal(object)
     finished_signal = pyqtSignal()
 
-    def __init__(self, base_dir, directory, source_lang, selected_languages, overwrite):
+    def __init__(self, directory, source_lang, selected_languages, overwrite):
         super().__init__()
-        self.base_dir           = base_dir
         self.directory          = directory
         self.source_lang        = source_lang
         self.selected_languages = selected_languages
         self.overwrite          = overwrite
+        self.tracker            = ProgressTracker()
+        self.scheduler          = None
+        self.remote_job         = None
+        self._cancel_requested  = False
+
+    def cancel(self):
+        self._cancel_requested = True
+        if self.scheduler:
+            self.scheduler.cancel()
+        if self.remote_job:
+            try:
+                cancel_job(DEFAULT_ADDRESS, self.remote_job)
+            except OSError:
+                pass
+
+    def _on_event(self, event):
+        self.tracker(event)
+        self.event_signal.emit(event)
+
+    def _journal(self, base: Path) -> JobJournal:
+        """Continues an unfinished job with the same settings, otherwise starts a new one."""
+        path     = base / JobJournal.FILE_NAME
+        settings = {
+            "source":      self.source_lang,
+            "overwrite":   self.overwrite,
+            "languages":   self.selected_languages,
+            "incremental": False,
+            "tr_code":     [],
+        }
+        if path.exists():
+            journal = JobJournal.resume(path)
+            if journal.settings == settings:
+                print(f"Resuming job — {len(journal.completed)} unit(s) and {len(journal.batches)} translation(s) already done")
+                return journal
+            journal.close()
+        return JobJournal.start(path, settings)
+
+    def _run_remote(self, base: Path):
+        """Hands the job to a running `translate.py serve` daemon and relays its output and events."""
+        status = None
+        try:
+            self.remote_job = submit_job(DEFAULT_ADDRESS, {
+                "directory": str(base),
+                "languages": self.selected_languages,
+                "source":    self.source_lang,
+                "overwrite": self.overwrite,
+            })
+            self.output_signal.emit(f"Job {self.remote_job} queued on the translation server at {DEFAULT_ADDRESS}")
+            if self._cancel_requested:
+                cancel_job(DEFAULT_ADDRESS, self.remote_job)
+            for record in job_records(DEFAULT_ADDRESS, self.remote_job):
+                if record["kind"] == "log":
+                    self.output_signal.emit(record["text"])
+                elif record["kind"] == "end":
+                    status = record["status"]
+                else:
+                    self._on_event(to_event(record))
+            self.output_signal.emit(f"\nJob {self.remote_job} {status}")
+        except (OSError, ValueError) as e:
+            self.output_signal.emit(f"[!] Translation server: {e}")
+        finally:
+            self.finished_signal.emit()
 
     def run(self):
-        python_exec = "python" if getattr(sys, 'frozen', False) else sys.executable
-        translate   = os.path.join(self.base_dir, "translate.py")
-
-        command = [python_exec, translate, self.directory]
-        if self.source_lang and self.source_lang != "EN":
-            command += ["-source", self.source_lang]
-        if self.overwrite:
-            command.append("-overwrite")
-        if self.selected_languages:
-            command += ["-languages"] + self.selected_languages
-
-        completed = 0
+        base = Path(self.directory).resolve()
+        if is_running(DEFAULT_ADDRESS):
+            return self._run_remote(base)
+
+        memory  = None
+        backend = None
         try:
-            process = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                encoding="utf-8",
-                creationflags=subprocess.CREATE_NO_WINDOW,
-                bufsize=1,
-                universal_newlines=True,
-            )
-
-            for line in iter(process.stdout.readline, ""):
-                stripped = line.rstrip()
-                self.output_signal.emit(stripped)
-                if LANG_LINE_RE.match(stripped):
-                    completed += 1
-                    self.progress_signal.emit(completed)
-
-            stderr_out = process.stderr.read()
-            if stderr_out:
-                self.output_signal.emit(f"[!] {stderr_out.strip()}")
-
-            process.stdout.close()
-            process.stderr.close()
-            process.wait()
+            with redirect_stdout(LogWriter(self.output_signal)):
+                backend        = GoogleBackend()
+                memory         = TranslationMemory(default_memory_path(backend.name))
+                self.scheduler = Scheduler(retry=RetryPolicy(fatal=backend.fatal_errors))
+                if self._cancel_requested:
+                    self.scheduler.cancel()
+                journal = self._journal(base)
+
+                translate_tree(
+                    base, self.selected_languages,
+                    source_lang=self.source_lang,
+                    skip_existing=not self.overwrite,
+                    backend=backend,
+                    memory=memory,
+                    scheduler=self.scheduler,
+                    journal=journal,
+                    progress=self._on_event,
+                    scan_index=DEFAULT_INDEX_PATH
+                )
+                self.scheduler.shutdown()
+                if self.scheduler.cancelled.is_set():
+                    journal.close()
+                    print("\nCancelled — finished work is saved and the next run continues from there")
+                else:
+                    journal.finish()
+                    print(f"\nFinished in {self.tracker.elapsed:.1f}s  |  {self.scheduler.calls} backend request(s)")
+        except Exception as e:
+            self.output_signal.emit(f"[!] {e}")
         finally:
+            if memory:
+                memory.close()
+            if backend:
+                backend.close()
             self.finished_signal.emit()
 
 
@@ -101,7 +171,6 @@ class TranslatorGUI(QWidget):
         self.base_dir  = self._resolve_base_dir()
         self.lang_info = self._load_lang_info()
         self._thread   = None
-        self._progress_total = 0
 
         self._build_ui()
         self._load_settings()
@@ -189,10 +258,18 @@ class TranslatorGUI(QWidget):
         lang_group.setLayout(lang_layout)
         layout.addWidget(lang_group, stretch=1)
 
+        run_row = QHBoxLayout()
         self.start_btn = QPushButton("▶  Start Translation")
         self.start_btn.setFixedHeight(36)
         self.start_btn.clicked.connect(self._run)
-        layout.addWidget(self.start_btn)
+        self.cancel_btn = QPushButton("■  Cancel")
+        self.cancel_btn.setFixedHeight(36)
+        self.cancel_btn.setFixedWidth(100)
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self._cancel)
+        run_row.addWidget(self.start_btn)
+        run_row.addWidget(self.cancel_btn)
+        layout.addLayout(run_row)
 
         self.progress_bar = QProgressBar()
         self.progress_bar.setFixedHeight(24)
@@ -200,6 +277,13 @@ class TranslatorGUI(QWidget):
         self.progress_bar.setTextVisible(True)
         layout.addWidget(self.progress_bar)
 
+        self.stats_label = QLabel("")
+        self.stats_label.setVisible(False)
+        layout.addWidget(self.stats_label)
+        self.stats_timer = QTimer(self)
+        self.stats_timer.setInterval(500)
+        self.stats_timer.timeout.connect(self._update_stats)
+
         log_group  = QGroupBox("Output Log")
         log_layout = QVBoxLayout()
         clear_btn  = QPushButton("Clear")
@@ -254,41 +338,61 @@ class TranslatorGUI(QWidget):
             if self.lang_list.item(i).checkState() == Qt.Checked
         ]
 
-        lang_count = len(selected) if selected else len([
-            k for k in self.lang_info if k != self.source_combo.currentText()
-        ])
-        folder_count       = count_translate_dirs(directory)
-        self._progress_total = lang_count * folder_count
-
         self.start_btn.setEnabled(False)
         self.start_btn.setText("Translating…")
+        self.cancel_btn.setEnabled(True)
 
-        self.progress_bar.setRange(0, max(self._progress_total, 1))
-        self.progress_bar.setValue(0)
-        self.progress_bar.setFormat(f"0 / {self._progress_total} languages")
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setFormat("Planning…")
         self.progress_bar.setVisible(True)
+        self.stats_label.setText("")
+        self.stats_label.setVisible(True)
 
         self._thread = TranslationThread(
-            base_dir           = self.base_dir,
             directory          = directory,
             source_lang        = self.source_combo.currentText(),
             selected_languages = selected,
             overwrite          = self.overwrite_check.isChecked(),
         )
         self._thread.output_signal.connect(self._append_log)
-        self._thread.progress_signal.connect(self._on_progress)
+        self._thread.event_signal.connect(self._on_event)
         self._thread.finished_signal.connect(self._done)
         self._thread.start()
-
-    def _on_progress(self, completed: int):
-        self.progress_bar.setValue(completed)
-        self.progress_bar.setFormat(f"{completed} / {self._progress_total} languages")
+        self.stats_timer.start()
+
+    def _cancel(self):
+        if self._thread:
+            self._thread.cancel()
+        self.cancel_btn.setEnabled(False)
+        self.start_btn.setText("Cancelling…")
+
+    def _on_event(self, event):
+        tracker = self._thread.tracker
+        if event.kind == "plan":
+            self.progress_bar.setRange(0, max(tracker.units, 1))
+        if event.kind in ("plan", "file"):
+            self.progress_bar.setValue(tracker.units_done)
+            self.progress_bar.setFormat(f"{tracker.units_done} / {tracker.units} files")
+
+    def _update_stats(self):
+        tracker = self._thread.tracker
+        eta     = tracker.eta
+        eta_note = f"  |  ETA {int(eta // 60)}:{int(eta % 60):02d}" if eta is not None else ""
+        self.stats_label.setText(
+            f"{tracker.strings} translated  |  {tracker.cached} known  |  {tracker.failed} failed  |  "
+            f"{tracker.strings_per_second:.1f} strings/s  |  {tracker.elapsed:.0f}s{eta_note}"
+        )
 
     def _done(self):
-        self.progress_bar.setValue(self._progress_total)
-        self.progress_bar.setFormat(f"Done — {self._progress_total} languages")
+        self.stats_timer.stop()
+        self._update_stats()
+        tracker = self._thread.tracker
+        self.progress_bar.setRange(0, max(tracker.units, 1))
+        self.progress_bar.setValue(tracker.units_done)
+        self.progress_bar.setFormat(f"Done — {tracker.units_done} / {tracker.units} files")
         self.start_btn.setEnabled(True)
         self.start_btn.setText("▶  Start Translation")
+        self.cancel_btn.setEnabled(False)
 
     def _load_settings(self):
         if not os.path.exists(SETTINGS_FILE):
@@ -327,6 +431,9 @@ class TranslatorGUI(QWidget):
 
     def closeEvent(self, event):
         self._save_settings()
+        if self._thread and self._thread.isRunning():
+            self._thread.cancel()
+            self._thread.wait()
         event.accept()
 
 
@@ -0,0 +1,186 @@
+import re
+from typing import NamedTuple
+
+HANDLED   = "handled"    # corrected automatically
+MALFORMED = "malformed"  # value skipped or used as-is
+WARNING   = "warning"    # duplicates and the like
+
+TABLE_START  = re.compile(r'[^{]*\{')
+SKIP         = re.compile(r'(?:[ \t\r\n,]+|--\[(=*)\[.*?\]\1\]|--[^\n]*)*', re.DOTALL)
+KEY          = re.compile(r'([^=\n{}"]*?)[ \t]*=[ \t]*')
+STRING       = re.compile(r'"((?:[^"\\\n]|\\.)*)"')
+MULTILINE    = re.compile(r'"((?:[^"\\]|\\.)*)"', re.DOTALL)
+ENTRY_START  = re.compile(r'\n[ \t]*[\w.]+[ \t]*=')
+CONCAT       = re.compile(r'(?:[ \t\r\n]+|--[^\n]*)*\.\.(?:[ \t\r\n]+|--[^\n]*)*(?=")')
+TRAILING     = re.compile(r'[ \t]*(\.(?!\.))?[ \t]*')
+VALUE_END    = re.compile(r',|(?=[\r\n}]|--)|$')
+REST_OF_LINE = re.compile(r'[^\n]*')
+PLAIN_VALUE  = re.compile(r'"([^"\\\n]*)"[ \t]*(,)?[ \t]*(?:--(?!\[)[^\n]*)?')
+
+
+class Diagnostic(NamedTuple):
+    line:    int
+    level:   str
+    message: str
+
+
+class ParsedTxt(NamedTuple):
+    entries:     dict
+    lines:       dict
+    diagnostics: list
+
+
+def parse(text: str) -> ParsedTxt:
+    """
+    Single-pass parser for pre-42.15 translation tables:
+
+        ItemName_EN = {
+            ItemName_Base.Axe = "Axe",
+            Tooltip_Long = "First part " ..   -- Lua concatenation
+                           "second part",
+            Recipe_Open = "Open { box }",
+        }
+
+    Returns {key: value}, {key: line number} and diagnostics with line numbers.
+    Multi-line quoted values are joined, `..` concatenations merged and `}` inside quotes kept;
+    \\" is unescaped, other escapes are left as written.
+    """
+    entries     = {}
+    lines       = {}
+    diagnostics = []
+
+    match = TABLE_START.match(text)
+    if not match:
+        return ParsedTxt(entries, lines, diagnostics)
+
+    pos    = match.end()
+    line   = 1 + text.count("\n", 0, pos)
+    length = len(text)
+
+    def note(level: str, message: str, at: int):
+        diagnostics.append(Diagnostic(at, level, message))
+
+    def is_blank(stripped: str) -> bool:
+        return not stripped or (stripped[:2] == "--" and stripped[2:3] != "[")
+
+    def plain_value(index: int, value: str):
+        """
+        The string in the stripped `value` of rows[index] when at most a comma and a -- comment follow it;
+        None when the line needs the tokenizer, e.g. a value without a comma that goes on with `..`.
+        """
+        if value[-1] == '"' and len(value) > 1:
+            string, comma = value[1:-1], None
+        else:
+            match = PLAIN_VALUE.fullmatch(value)
+            if not match:
+                return None
+            string, comma = match.groups()
+        if not comma:
+            if ".." in value:
+                return None
+            for following in range(index + 1, len(rows)):
+                stripped = rows[following].strip()
+                if stripped[:1] not in ".-":
+                    if stripped:
+                        break
+                elif not is_blank(stripped) or ".." in stripped:
+                    return None
+        return string
+
+    rows = text.split("\n")
+    while True:
+        # the common case a whole line at a time: blank lines, -- comments and `key = "value"` lines with
+        # nothing to unescape; anything else (block comments, `..`, multi-line values, ...) is tokenized
+        end = text.find("\n", pos)
+        if end != -1 and is_blank(text[pos:end].strip()):
+            first = line  # rows[line] is the line after the current one
+            for index in range(first, len(rows)):
+                key, _, value = rows[index].partition("=")
+                value         = value.strip()
+                if value[-2:] == '",' and value[0] == '"' and len(value) > 2:
+                    value = value[1:-2]
+                elif value[:1] == '"':
+                    value = plain_value(index, value)
+                else:
+                    value = None
+                if value is not None:
+                    key = key.strip()
+                    if (key and key[0] not in "-," and '"' not in key and "{" not in key and "}" not in key
+                            and '"' not in value and "\\" not in value):
+                        if key in lines:
+                            note(WARNING, f"Duplicate key '{key}' (first on line {lines[key]})", index + 1)
+                        entries[key] = value
+                        lines[key]   = index + 1
+                        continue
+                if not is_blank(rows[index].strip()):
+                    break
+            else:
+                index = len(rows)
+            pos  = min(length, end + 1 + sum(map(len, rows[first:index])) + index - first)
+            line = index + 1
+
+        skipped = SKIP.match(text, pos).end()
+        line   += text.count("\n", pos, skipped)
+        pos     = skipped
+        if pos >= length or text[pos] == "}":
+            break
+
+        entry_line = line
+        match      = KEY.match(text, pos)
+        key        = match.group(1).strip() if match else ""
+        if not key:
+            end = REST_OF_LINE.match(text, pos).end()
+            note(MALFORMED, f"Not a 'key = value' line — skipped: {text[pos:end].strip()}", line)
+            pos = end
+            continue
+        pos = match.end()
+
+        if pos < length and text[pos] == '"':
+            parts = []
+            while True:
+                match = STRING.match(text, pos)
+                if not match:
+                    match = MULTILINE.match(text, pos)
+                    if match and not ENTRY_START.search(match.group(1)):
+                        note(HANDLED, f"Multi-line value joined for '{key}'", line)
+                    else:
+                        match = None
+                if not match:
+                    end = REST_OF_LINE.match(text, pos).end()
+                    note(MALFORMED, f"No closing quote for '{key}' — used as-is: {text[pos:end].strip()}", line)
+                    parts.append(text[pos + 1:end].rstrip())
+                    pos = end
+                    break
+                parts.append(match.group(1))
+                line += text.count("\n", pos, match.end())
+                pos   = match.end()
+
+                concat = CONCAT.match(text, pos)
+                if not concat:
+                    break
+                line += text.count("\n", pos, concat.end())
+                pos   = concat.end()
+            value = "".join(parts).replace('\\"', '"')
+
+            trailing = TRAILING.match(text, pos)
+            if trailing.group(1):
+                note(HANDLED, f"Trailing period corrected for '{key}'", line)
+            pos = trailing.end()
+            end = VALUE_END.match(text, pos)
+            if end:
+                pos = end.end()
+            else:
+                rest = REST_OF_LINE.match(text, pos).end()
+                note(MALFORMED, f"Unexpected text after '{key}' — ignored: {text[pos:rest].strip()}", line)
+                pos = rest
+        else:
+            end   = REST_OF_LINE.match(text, pos).end()
+            value = text[pos:end].rstrip().removesuffix(",").rstrip()
+            pos   = end
+
+        if key in entries:
+            note(WARNING, f"Duplicate key '{key}' (first on line {lines[key]})", entry_line)
+        entries[key] = value
+        lines[key]   = entry_line
+
+    return ParsedTxt(entries, lines, diagnostics)
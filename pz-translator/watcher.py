@@ -0,0 +1,125 @@
+import os
+import time
+import threading
+from pathlib import Path
+from scanner import SOURCE_SUFFIXES
+
+DEFAULT_INTERVAL = 0.5  # seconds between polls
+DEFAULT_DEBOUNCE = 1.0  # quiet time after the last change before translating
+
+
+class SourceWatcher:
+    """
+    Polls source language folders for saved, added and removed files.
+    Only those folders are listed (one scandir per folder per poll, no file is opened), so polling is cheap
+    on large trees and behaves the same on Windows, Linux and network drives. Like the translator, a folder
+    holding .json files is tracked by those alone; otherwise its .txt files are.
+    """
+
+    def __init__(self, folders: list, interval: float = DEFAULT_INTERVAL, debounce: float = DEFAULT_DEBOUNCE):
+        self.folders  = list(folders)
+        self.interval = interval
+        self.debounce = debounce
+        self.files    = self._snapshot()
+
+    def _list(self, folder: Path) -> dict:
+        found = {}
+        stack = [folder]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for item in it:
+                        try:
+                            if item.is_dir():
+                                stack.append(item.path)
+                            elif item.name.lower().endswith(SOURCE_SUFFIXES):
+                                stat = item.stat()
+                                found[Path(item.path)] = (stat.st_mtime_ns, stat.st_size)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        json_files = {path: state for path, state in found.items() if path.suffix.lower() == ".json"}
+        return json_files or found
+
+    def _snapshot(self) -> dict:
+        """{source file: (mtime_ns, size)}"""
+        files = {}
+        for folder in self.folders:
+            files.update(self._list(folder))
+        return files
+
+    def wait(self, stop: threading.Event) -> tuple:
+        """
+        Blocks until files change and then stay untouched for `debounce` seconds, so a burst of saves
+        (or an editor writing a temp file and renaming it) is handled once. Returns (changed, removed) paths.
+        """
+        changed, removed = set(), set()
+        last_change = None
+        while not stop.wait(self.interval):
+            current = self._snapshot()
+            saved   = {path for path, state in current.items() if self.files.get(path) != state}
+            gone    = self.files.keys() - current.keys()
+            self.files = current
+            if saved or gone:
+                changed = (changed | saved) - gone
+                removed = (removed | gone) - saved
+                last_change = time.monotonic()
+            elif last_change is not None and time.monotonic() - last_change >= self.debounce:
+                break
+        return changed, removed
+
+
+def changed_keys(previous, current) -> set:
+    """Keys added or whose value changed between two parses of a source file."""
+    return {key for key, value in current.items() if key not in previous or previous[key] != value}
+
+
+def watch(translators: list, interval: float = DEFAULT_INTERVAL, debounce: float = DEFAULT_DEBOUNCE,
+          stop: threading.Event = None):
+    """
+    Keeps every target language of the given Translators in step with their source language folder until
+    `stop` is set. Each saved file is parsed again and compared with its previous parse; only added or
+    modified keys are translated (through the translators' cache, memory and scheduler) and written to
+    every language. Removed keys disappear from the targets on the next write, as in a normal run.
+    """
+    stop    = stop or threading.Event()
+    owners  = {t._get_translation_path(t.source_lang): t for t in translators}
+    watcher = SourceWatcher(list(owners), interval, debounce)
+
+    def owner_of(path: Path):
+        return next(owner for folder, owner in owners.items() if folder in path.parents)
+
+    parsed = {}
+    for path in sorted(watcher.files):
+        src = owner_of(path).parse_source(path)
+        if src is not None:
+            parsed[path] = src
+    print(f"\nWatching {len(watcher.files)} source file(s) in {len(owners)} Translate folder(s) — Ctrl+C to stop")
+
+    while not stop.is_set():
+        changed, removed = watcher.wait(stop)
+        for path in sorted(removed):
+            if parsed.pop(path, None):
+                print(f"  [!] {path.name} was removed — its translations are left in place")
+
+        updates = {}
+        for path in sorted(changed):
+            owner = owner_of(path)
+            src   = owner.parse_source(path)
+            if src is None:
+                continue  # unreadable mid-edit; the next save is compared with the last good parse
+            previous     = parsed[path].entries if path in parsed else {}
+            keys         = changed_keys(previous, src.entries)
+            parsed[path] = src
+            if keys or previous.keys() - src.entries.keys():
+                updates.setdefault(owner, []).append((src, keys))
+
+        for owner, changes in updates.items():
+            start  = time.perf_counter()
+            counts = owner.update_sources(changes)
+            names  = ", ".join(f"{src.name} ({len(keys)} key(s))" for src, keys in changes)
+            print(
+                f"  Updated {names}  →  "
+                f"{sum(counts.values())} string(s) translated for {len(counts)} language(s) in {time.perf_counter() - start:.1f}s"
+            )
@@ -0,0 +1,99 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "pz-translator"))
+
+import txt_tokenizer
+from txt_tokenizer import HANDLED, MALFORMED, WARNING
+
+
+def parse(body: str) -> txt_tokenizer.ParsedTxt:
+    return txt_tokenizer.parse("IGUI_EN = {\n" + body + "}\n")
+
+
+def levels(parsed) -> list:
+    return [(d.line, d.level) for d in parsed.diagnostics]
+
+
+def test_simple_entries_and_line_numbers():
+    parsed = parse('    IGUI_Open = "Open",\n    IGUI_Close = "Close",\n')
+    assert parsed.entries == {"IGUI_Open": "Open", "IGUI_Close": "Close"}
+    assert parsed.lines == {"IGUI_Open": 2, "IGUI_Close": 3}
+    assert parsed.diagnostics == []
+
+
+def test_concatenation():
+    parsed = parse('    Tooltip = "First part " ..   -- comment\n              "second part",\n    Next = "x",\n')
+    assert parsed.entries == {"Tooltip": "First part second part", "Next": "x"}
+    assert parsed.lines["Next"] == 4
+
+
+def test_concatenation_on_the_next_line():
+    parsed = parse('    Key = "first"\n          .. " second",\n    Next = "x"\n')
+    assert parsed.entries == {"Key": "first second", "Next": "x"}
+
+
+def test_multi_line_value_is_joined():
+    parsed = parse('    Long = "first line\nsecond line",\n    Next = "x",\n')
+    assert parsed.entries["Long"] == "first line\nsecond line"
+    assert parsed.entries["Next"] == "x"
+    assert parsed.lines["Next"] == 4
+    assert levels(parsed) == [(2, HANDLED)]
+
+
+def test_braces_and_comment_markers_inside_quotes():
+    parsed = parse('    Box = "Open { box }",\n    Close = "a } b",\n    Dash = "one -- two",\n')
+    assert parsed.entries == {"Box": "Open { box }", "Close": "a } b", "Dash": "one -- two"}
+    assert parsed.diagnostics == []
+
+
+def test_comments_outside_quotes_are_skipped():
+    parsed = parse('    -- a comment\n    --[[ block\n    comment ]]\n    Key = "value", -- trailing\n')
+    assert parsed.entries == {"Key": "value"}
+    assert parsed.lines["Key"] == 5
+
+
+def test_commented_out_entries_are_skipped():
+    parsed = parse('    -- Old = "value",\n    Key = "value" -- note\n    Next = "x", -- note\n')
+    assert parsed.entries == {"Key": "value", "Next": "x"}
+    assert parsed.lines == {"Key": 3, "Next": 4}
+    assert parse('    -- Old = "value",\n    Key = "value".\n').entries == {"Key": "value"}
+
+
+def test_escaped_quotes():
+    parsed = parse('    Say = "Say \\"hi\\"",\n    Path = "C:\\\\mods",\n')
+    assert parsed.entries["Say"] == 'Say "hi"'
+    assert parsed.entries["Path"] == "C:\\\\mods"
+
+
+def test_missing_closing_quote_is_used_as_is():
+    parsed = parse('    Broken = "no end,\n    Next = "x",\n')
+    assert parsed.entries["Broken"] == "no end,"
+    assert parsed.entries["Next"] == "x"
+    assert levels(parsed) == [(2, MALFORMED)]
+
+
+def test_trailing_period_is_corrected():
+    parsed = parse('    Key = "value".\n    Next = "x",\n')
+    assert parsed.entries == {"Key": "value", "Next": "x"}
+    assert levels(parsed) == [(2, HANDLED)]
+
+
+def test_duplicate_keys_keep_the_last_value():
+    parsed = parse('    Key = "first",\n    Other = "x",\n    Key = "second",\n')
+    assert parsed.entries["Key"] == "second"
+    assert parsed.lines["Key"] == 4
+    assert len(parsed.diagnostics) == 1
+    diagnostic = parsed.diagnostics[0]
+    assert (diagnostic.line, diagnostic.level) == (4, WARNING)
+    assert "first on line 2" in diagnostic.message
+
+
+def test_line_without_key_is_skipped():
+    parsed = parse('    just some text\n    Key = "value",\n')
+    assert parsed.entries == {"Key": "value"}
+    assert levels(parsed) == [(2, MALFORMED)]
+
+
+def test_no_table():
+    assert txt_tokenizer.parse("no table here").entries == {}